@@ -1,21 +1,115 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ID, CONF_MODEL, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_DEVICES, CONF_ID, CONF_MODEL, CONF_TYPE, EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
+from .aggregates import FleetAggregator
 from .airwater.const import AirWaterModel
-from .airwater.device import STORAGE_VERSION, AirWaterDevice, AirWaterSettingsStore
-from .const import CONF_MQTT_HOST, CONF_MQTT_PORT, CONF_SIGN_KEY, DEVICES, DOMAIN, PLATFORMS, SETTING_STORES
+from .airwater.controller import AirWaterControllerType
+from .airwater.device import CONTROLLER_MIN_INTERVAL, STORAGE_VERSION, AirWaterDevice, AirWaterSettingsStore
+from .airwater.usage import AirWaterUsageStore
+from .analytics import FleetAnalytics
+from .const import (
+    AGGREGATES,
+    CONF_CAPTURE_SIZE,
+    CONF_CONTROLLER,
+    CONF_CONTROLLER_INTERVAL,
+    CONF_CONTROLLER_SOURCE,
+    CONF_GROUP_BY_AREA,
+    CONF_MQTT_HOST,
+    CONF_MQTT_PORT,
+    CONF_POLL_INTERVAL,
+    CONF_SIGN_KEY,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_POLL_INTERVAL,
+    DEVICES,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    ENTRY_TYPE_HUB,
+    FLEET,
+    FLEET_PLATFORMS,
+    GOVERNOR,
+    GOVERNOR_SENSOR_HOSTS,
+    HUBS,
+    MAX_PARALLEL_STARTS,
+    MQTT_DISCOVERY,
+    PLATFORMS,
+    SETTING_STORES,
+    SETUP_TIMES,
+    SIGNAL_DEVICE_ADDED,
+    SIGNAL_DEVICE_REMOVED,
+    START_SEMAPHORE,
+    START_TASKS,
+    TRACER,
+)
+from .discovery import AirWaterMQTTDiscovery
+from .governor import LoadGovernor
+from .hub import AirWaterHub
+from .services import async_register_services
+from .tracing import Tracer
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _: ConfigType) -> bool:
+    governor = LoadGovernor(hass)
+    governor.async_start()
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, governor.async_stop)
+    tracer = Tracer(hass)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, tracer.async_flush)
+
+    hass.data.setdefault(
+        DOMAIN,
+        {
+            SETTING_STORES: {},
+            DEVICES: {},
+            SETUP_TIMES: {},
+            START_SEMAPHORE: asyncio.Semaphore(MAX_PARALLEL_STARTS),
+            START_TASKS: {},
+            GOVERNOR: governor,
+            GOVERNOR_SENSOR_HOSTS: {},
+            TRACER: tracer,
+            MQTT_DISCOVERY: {},
+            HUBS: {},
+        },
+    )
+
+    async def async_stop_mqtt_discovery(_: Event) -> None:
+        for listener in hass.data[DOMAIN][MQTT_DISCOVERY].values():
+            await listener.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_mqtt_discovery)
+    async_register_websocket_commands(hass)
+    async_register_services(hass)
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_FLEET:
+        return await _async_setup_fleet_entry(hass, entry)
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_HUB:
+        return await _async_setup_hub_entry(hass, entry)
+
+    setup_started_at = time.monotonic()
     device_id = entry.data[CONF_ID]
+    for hub in hass.data[DOMAIN][HUBS].values():  # before the entities are added, they share the unique_ids
+        await hub.async_release_device(device_id)
+
     settings_store = AirWaterSettingsStore(
         hass,
         STORAGE_VERSION,
@@ -30,27 +124,131 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data[CONF_SIGN_KEY],
         entry.data[CONF_MQTT_HOST],
         entry.data[CONF_MQTT_PORT],
+        hass.data[DOMAIN][GOVERNOR],
+        hass.data[DOMAIN][TRACER],
+        AirWaterUsageStore(hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{device_id}_usage"),
     )
+    device.poll_interval = _get_poll_interval(entry)
     await device.async_setup()
+    _apply_device_options(device, entry)
 
-    hass.data.setdefault(DOMAIN, {SETTING_STORES: {}, DEVICES: {}})
     hass.data[DOMAIN][DEVICES][entry.entry_id] = device
     hass.data[DOMAIN][SETTING_STORES][entry.entry_id] = settings_store
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_DEVICE_ADDED, device)
+    _async_add_mqtt_discovery(hass, entry)
 
     entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, device.async_stop))
     entry.async_on_unload(entry.add_update_listener(_async_entry_update_listener))
 
+    setup_times = hass.data[DOMAIN][SETUP_TIMES][entry.entry_id] = {"setup": time.monotonic() - setup_started_at}
+    hass.data[DOMAIN][START_TASKS][entry.entry_id] = entry.async_create_background_task(
+        hass, _async_start_device(hass, device, setup_times), f"{DOMAIN}_start_{device_id}"
+    )
+
     return True
 
 
+async def _async_setup_fleet_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    analytics = hass.data[DOMAIN][FLEET] = FleetAnalytics(hass, hass.data[DOMAIN][DEVICES].values)
+    aggregator = hass.data[DOMAIN][AGGREGATES] = FleetAggregator(hass, entry.options.get(CONF_GROUP_BY_AREA, False))
+    aggregator.async_start(hass.data[DOMAIN][DEVICES].values())
+    entry.async_on_unload(aggregator.async_stop)
+
+    await hass.config_entries.async_forward_entry_setups(entry, FLEET_PLATFORMS)
+    await analytics.async_start()
+    entry.async_on_unload(analytics.async_stop)
+    entry.async_on_unload(entry.add_update_listener(_async_fleet_entry_update_listener))
+
+    return True
+
+
+async def _async_setup_hub_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    def configure_device(device: AirWaterDevice) -> None:
+        device.poll_interval = _get_poll_interval(entry)
+        _apply_device_options(device, entry)
+
+    hub = hass.data[DOMAIN][HUBS][entry.entry_id] = AirWaterHub(hass, entry, configure_device)
+    await hub.async_setup()
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, hub.async_stop))
+    entry.async_on_unload(entry.add_update_listener(_async_hub_entry_update_listener))
+    hass.data[DOMAIN][START_TASKS][entry.entry_id] = entry.async_create_background_task(
+        hass, hub.async_start(), f"{DOMAIN}_start_hub_{entry.entry_id}"
+    )
+
+    return True
+
+
+@callback
+def _async_add_mqtt_discovery(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Listen for unknown devices on the broker of the entry, one listener per broker."""
+    listeners: dict[tuple[str, int], AirWaterMQTTDiscovery] = hass.data[DOMAIN][MQTT_DISCOVERY]
+    broker = (entry.data[CONF_MQTT_HOST], entry.data[CONF_MQTT_PORT])
+    if (listener := listeners.get(broker)) is None:
+        listener = listeners[broker] = AirWaterMQTTDiscovery(hass, *broker)
+        hass.async_create_background_task(listener.async_start(), f"{DOMAIN}_mqtt_discovery_{broker[0]}")
+
+    listener.entry_ids.add(entry.entry_id)
+
+
+async def _async_remove_mqtt_discovery(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    listeners: dict[tuple[str, int], AirWaterMQTTDiscovery] = hass.data[DOMAIN][MQTT_DISCOVERY]
+    for broker, listener in list(listeners.items()):
+        listener.entry_ids.discard(entry.entry_id)
+        if not listener.entry_ids:
+            await listeners.pop(broker).async_stop()
+
+
+async def _async_start_device(hass: HomeAssistant, device: AirWaterDevice, setup_times: dict[str, float]) -> None:
+    """Connect the device to MQTT off the setup path, limiting the number of simultaneous connections."""
+    queued_at = time.monotonic()
+    async with hass.data[DOMAIN][START_SEMAPHORE]:
+        started_at = time.monotonic()
+        await device.async_start()
+
+    setup_times["start_wait"] = started_at - queued_at
+    setup_times["start"] = time.monotonic() - started_at
+    _LOGGER.debug("%s started: %s", device.name, setup_times)
+
+
+async def _async_cancel_start(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Cancel a start still waiting for its turn or connecting, so it can't start polling after the stop."""
+    task: asyncio.Task[None] | None = hass.data[DOMAIN][START_TASKS].pop(entry.entry_id, None)
+    if task is None or task.done():
+        return
+
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_FLEET:
+        if unload_ok := await hass.config_entries.async_unload_platforms(entry, FLEET_PLATFORMS):
+            hass.data[DOMAIN].pop(FLEET)
+            hass.data[DOMAIN].pop(AGGREGATES)
+
+        return unload_ok
+
+    await _async_cancel_start(hass, entry)
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_HUB:
+        await hass.data[DOMAIN][HUBS][entry.entry_id].async_stop()
+        if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+            hass.data[DOMAIN][HUBS].pop(entry.entry_id)
+
+        return unload_ok
+
     device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
     await device.async_stop()
+    async_dispatcher_send(hass, SIGNAL_DEVICE_REMOVED, device)
+    await _async_remove_mqtt_discovery(hass, entry)
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN][DEVICES].pop(entry.entry_id)
+        hass.data[DOMAIN][SETUP_TIMES].pop(entry.entry_id, None)
 
     return unload_ok
 
@@ -60,6 +258,60 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     if settings_store:
         await settings_store.async_remove()
 
+    if device_id := entry.data.get(CONF_ID):
+        await AirWaterUsageStore(hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{device_id}_usage").async_remove()
+
+    for data in entry.data.get(CONF_DEVICES, []):
+        await AirWaterSettingsStore(hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{data[CONF_ID]}").async_remove()
+        await AirWaterUsageStore(hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{data[CONF_ID]}_usage").async_remove()
+
 
 async def _async_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
+    connection_params = (entry.data[CONF_MQTT_HOST], entry.data[CONF_MQTT_PORT], entry.data[CONF_SIGN_KEY])
+    if device.connection_params != connection_params:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    model = AirWaterModel(entry.data[CONF_MODEL])
+    features_changed = model.features != device.model.features
+    await device.async_reconfigure(model, _get_poll_interval(entry))
+    _apply_device_options(device, entry)
+
+    device_registry = dr.async_get(hass)
+    if device_entry := device_registry.async_get_device({(DOMAIN, f"airwater_{device.id}")}):
+        device_registry.async_update_device(device_entry.id, name=device.name, model=model.human_readable)
+
+    if features_changed:
+        _LOGGER.debug(f"Features of {device.name} changed, reloading platforms")
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+
+async def _async_fleet_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_hub_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply the options to all hub devices, the device list is updated by the hub itself."""
+    hub: AirWaterHub = hass.data[DOMAIN][HUBS][entry.entry_id]
+    poll_interval = _get_poll_interval(entry)
+    for device in hub.devices.values():
+        if device.poll_interval != poll_interval:
+            await device.async_reconfigure(device.model, poll_interval)
+
+        _apply_device_options(device, entry)
+
+
+def _apply_device_options(device: AirWaterDevice, entry: ConfigEntry) -> None:
+    device.trace_sample_rate = entry.options.get(CONF_TRACE_SAMPLE_RATE, 0)
+    device.capture_size = int(entry.options.get(CONF_CAPTURE_SIZE, 0))
+    device.controller_interval = entry.options.get(CONF_CONTROLLER_INTERVAL, CONTROLLER_MIN_INTERVAL)
+    device.set_controller(
+        AirWaterControllerType(entry.options.get(CONF_CONTROLLER, AirWaterControllerType.OFF)),
+        entry.options.get(CONF_CONTROLLER_SOURCE),
+    )
+
+
+def _get_poll_interval(entry: ConfigEntry) -> timedelta:
+    return timedelta(seconds=entry.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL))
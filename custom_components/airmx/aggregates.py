@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Self
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .airwater.device import AirWaterDevice
+from .const import DOMAIN, SIGNAL_DEVICE_ADDED, SIGNAL_DEVICE_REMOVED
+
+REFILL_WATER_LEVEL = 10  # %
+
+FLEET_GROUP = ""
+
+
+@dataclass
+class Aggregate:
+    devices: int = 0
+    humidity_sum: float = 0.0
+    humidity_count: int = 0
+    need_cleaning: int = 0
+    need_refill: int = 0
+
+    @property
+    def average_humidity(self) -> float | None:
+        if not self.humidity_count:
+            return None
+
+        return round(self.humidity_sum / self.humidity_count, 1)
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """Values a single device adds to the aggregates of its groups."""
+
+    humidity: float | None = None
+    need_cleaning: bool = False
+    need_refill: bool = False
+
+    @classmethod
+    def from_status(cls, device: AirWaterDevice, changes: dict[str, Any] | None = None) -> Self:
+        status = device.status
+        changes = changes or {}
+
+        if changes.get("remote_sensor_online", status.remote_sensor_online):
+            humidity = changes.get("remote_sensor_humidity", status.remote_sensor_humidity)
+        else:
+            humidity = changes.get("internal_sensor_humidity", status.internal_sensor_humidity)
+
+        water_level = changes.get("water_level", status.water_level)
+        return cls(
+            humidity=humidity,
+            need_cleaning=changes.get("need_cleaning", status.need_cleaning),
+            need_refill=water_level is not None and water_level <= REFILL_WATER_LEVEL,
+        )
+
+    def apply(self, aggregate: Aggregate, sign: int) -> None:
+        aggregate.devices += sign
+        if self.humidity is not None:
+            aggregate.humidity_sum += sign * self.humidity
+            aggregate.humidity_count += sign
+
+        aggregate.need_cleaning += sign * self.need_cleaning
+        aggregate.need_refill += sign * self.need_refill
+
+
+class FleetAggregator:
+    """Keep running sums and counts across all devices and optionally per area.
+
+    A status change subtracts the previous contribution of the device and adds the new one,
+    so only the groups of that device are touched.
+    """
+
+    def __init__(self, hass: HomeAssistant, group_by_area: bool):
+        self._hass = hass
+        self._group_by_area = group_by_area
+        self._devices: dict[int, AirWaterDevice] = {}
+        self._contributions: dict[int, tuple[str | None, Contribution]] = {}
+        self._unsubs: dict[int, CALLBACK_TYPE] = {}
+        self._unsub_signals: list[CALLBACK_TYPE] = []
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+        self._group_listeners: list[Callable[[str], None]] = []
+
+        self.groups: dict[str, Aggregate] = {FLEET_GROUP: Aggregate()}
+
+    @callback
+    def async_start(self, devices: Iterable[AirWaterDevice]) -> None:
+        for device in devices:
+            self._async_add_device(device)
+
+        self._unsub_signals = [
+            async_dispatcher_connect(self._hass, SIGNAL_DEVICE_ADDED, self._async_add_device),
+            async_dispatcher_connect(self._hass, SIGNAL_DEVICE_REMOVED, self._async_remove_device),
+        ]
+        if self._group_by_area:
+            self._unsub_signals.append(
+                self._hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_handle_registry_update)
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        for unsub in [*self._unsub_signals, *self._unsubs.values()]:
+            unsub()
+
+        self._unsub_signals.clear()
+        self._unsubs.clear()
+
+    @callback
+    def async_add_listener(self, group: str, cb: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener to notify when the aggregate of the group is changed."""
+
+        def unsub() -> None:
+            self._listeners[group].remove(cb)
+
+        self._listeners.setdefault(group, []).append(cb)
+        return unsub
+
+    @callback
+    def async_add_group_listener(self, cb: Callable[[str], None]) -> Callable[[], None]:
+        """Add a listener to notify when a new area group appears."""
+
+        def unsub() -> None:
+            self._group_listeners.remove(cb)
+
+        self._group_listeners.append(cb)
+        return unsub
+
+    @callback
+    def _async_add_device(self, device: AirWaterDevice) -> None:
+        if device.id in self._devices:
+            return
+
+        self._devices[device.id] = device
+        self._set_contribution(device.id, self._get_area(device.id), Contribution.from_status(device))
+        self._unsubs[device.id] = device.async_add_status_listener(self._async_handle_status_changes)
+
+    @callback
+    def _async_remove_device(self, device: AirWaterDevice) -> None:
+        if self._devices.pop(device.id, None) is None:
+            return
+
+        self._unsubs.pop(device.id)()
+        self._set_contribution(device.id, None, None)
+
+    @callback
+    def _async_handle_status_changes(self, device_id: int, changes: dict[str, Any]) -> None:
+        area, _ = self._contributions[device_id]
+        self._set_contribution(device_id, area, Contribution.from_status(self._devices[device_id], changes))
+
+    @callback
+    def _async_handle_registry_update(self, event: Event[dr.EventDeviceRegistryUpdatedData]) -> None:
+        if event.data["action"] != "update" or "area_id" not in event.data["changes"]:
+            return
+
+        if not (device_entry := dr.async_get(self._hass).async_get(event.data["device_id"])):
+            return
+
+        for domain, identifier in device_entry.identifiers:
+            if domain == DOMAIN and identifier.startswith("airwater_"):
+                device_id = int(identifier.removeprefix("airwater_"))
+                if device_id in self._contributions:
+                    _, contribution = self._contributions[device_id]
+                    self._set_contribution(device_id, device_entry.area_id, contribution)
+
+    def _set_contribution(self, device_id: int, area: str | None, contribution: Contribution | None) -> None:
+        previous = self._contributions.pop(device_id, None)
+        if contribution is not None:
+            if previous == (area, contribution):
+                self._contributions[device_id] = previous
+                return
+
+            self._contributions[device_id] = (area, contribution)
+
+        changed_groups = set()
+        if previous is not None:
+            previous_area, previous_contribution = previous
+            for group in self._groups_of(previous_area):
+                previous_contribution.apply(self.groups[group], -1)
+                changed_groups.add(group)
+
+        if contribution is not None:
+            for group in self._groups_of(area):
+                if group not in self.groups:
+                    self.groups[group] = Aggregate()
+                    for group_listener in self._group_listeners:
+                        group_listener(group)
+
+                contribution.apply(self.groups[group], 1)
+                changed_groups.add(group)
+
+        for group in changed_groups:
+            for listener in self._listeners.get(group, []):
+                listener()
+
+    @staticmethod
+    def _groups_of(area: str | None) -> tuple[str, ...]:
+        return (FLEET_GROUP,) if area is None else (FLEET_GROUP, area)
+
+    def _get_area(self, device_id: int) -> str | None:
+        if not self._group_by_area:
+            return None
+
+        if device_entry := dr.async_get(self._hass).async_get_device({(DOMAIN, f"airwater_{device_id}")}):
+            return device_entry.area_id
+
+        return None
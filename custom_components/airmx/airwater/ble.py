@@ -11,6 +11,18 @@ _LOGGER = logging.getLogger(__name__)
 PACKET_SIZE = 16
 NOTIFICATION_UUID = "22210002-554a-4546-5542-46534450464d"
 COMMAND_UUID = "22210001-554a-4546-5542-46534450464d"
+BIND_AP_DONE = b"\x00\x11\x00\x15\x01"
+BIND_AP_TIMEOUT = 18
+BIND_AP_ATTEMPTS = 3
+BIND_AP_RETRY_DELAY = 1
+
+
+class AirWaterBindAPError(Exception):
+    pass
+
+
+class AirWaterBindAPTimeout(AirWaterBindAPError):
+    pass
 
 
 @dataclass
@@ -28,54 +40,78 @@ class BindAPRequest:
         return data
 
 
+def build_bind_ap_packets(request: bytes) -> list[bytes]:
+    """Split the request into frames: seq, csum ((seq + 1) << 4 | packet count), command and 16 bytes of data."""
+    packet_count = -(-len(request) // PACKET_SIZE)
+
+    packets = []
+    for seq in range(packet_count):
+        csum = ((seq + 1) << 4) + packet_count
+        packets.append(
+            seq.to_bytes() + csum.to_bytes() + b"\x00\x15" + request[seq * PACKET_SIZE : (seq + 1) * PACKET_SIZE]
+        )
+
+    return packets
+
+
+def build_bind_ap_ack_packet(packet_count: int) -> bytes:
+    return packet_count.to_bytes() + b"\x11\x00\x16"
+
+
 class AirWaterBLEConnector:
-    _bind_ap_done = False
+    def __init__(self) -> None:
+        self._bind_ap_done = asyncio.Event()
 
     def _notification_handler(self, _: BleakGATTCharacteristic, data: bytearray) -> None:
         _LOGGER.debug("< %s", data.hex())
-        if data != b"\x00\x11\x00\x15\x01":
-            _LOGGER.error(f"Unexpected data: {data.hex()}")
+        if data != BIND_AP_DONE:
+            _LOGGER.error("Unexpected data: %s", data.hex())
         else:
-            self._bind_ap_done = True
+            self._bind_ap_done.set()
 
     async def bind_ap(self, device: BLEDevice, ssid: str, password: str) -> None:
-        _LOGGER.debug(f"Connecting to {device}...")
+        packets = build_bind_ap_packets(BindAPRequest(ssid, password).as_bytes)
 
-        async with BleakClient(device) as client:
-            await client.start_notify(NOTIFICATION_UUID, self._notification_handler)
+        for attempt in range(1, BIND_AP_ATTEMPTS + 1):
+            try:
+                await self._async_bind_ap(device, packets)
+                return
+            except (AirWaterBindAPTimeout, BleakError, TimeoutError) as e:
+                if attempt == BIND_AP_ATTEMPTS:
+                    if isinstance(e, AirWaterBindAPTimeout):
+                        raise
 
-            request = BindAPRequest(ssid, password).as_bytes
-            request_size = len(request)
-            packet_count = int(request_size / PACKET_SIZE)
-            if request_size % 16 > 0:
-                packet_count += 1
+                    raise AirWaterBindAPError(f"AP binding failed: {e}") from e
 
-            for seq in range(0, packet_count):
-                csum = (seq + 1 << 4) + packet_count
+                _LOGGER.debug("AP binding attempt %d to %s failed: %r", attempt, device, e)
+                await asyncio.sleep(BIND_AP_RETRY_DELAY)
 
-                packet = b""
-                packet += seq.to_bytes()
-                packet += csum.to_bytes()
-                packet += b"\x00\x15"
+    async def _async_bind_ap(self, device: BLEDevice, packets: list[bytes]) -> None:
+        _LOGGER.debug("Connecting to %s...", device)
+        self._bind_ap_done.clear()
 
-                f = seq * PACKET_SIZE
-                s = seq * PACKET_SIZE + PACKET_SIZE
-                packet += request[f:s]
+        async with BleakClient(device) as client:
+            await client.start_notify(NOTIFICATION_UUID, self._notification_handler)
 
+            # when the characteristic allows it only the last frame waits for the response,
+            # the device acknowledges the whole request
+            characteristic = client.services.get_characteristic(COMMAND_UUID)
+            without_response = characteristic is not None and "write-without-response" in characteristic.properties
+            for index, packet in enumerate(packets):
                 _LOGGER.debug("> %s", packet.hex())
-                await client.write_gatt_char(COMMAND_UUID, packet, response=True)
-
-            for _ in range(0, 60):
-                await asyncio.sleep(0.3)
-                if self._bind_ap_done:
-                    break
+                await client.write_gatt_char(
+                    COMMAND_UUID, packet, response=not without_response or index == len(packets) - 1
+                )
 
-            if not self._bind_ap_done:
-                raise Exception("AP binding timeout")
+            try:
+                async with asyncio.timeout(BIND_AP_TIMEOUT):
+                    await self._bind_ap_done.wait()
+            except TimeoutError as e:
+                raise AirWaterBindAPTimeout(f"AP binding timeout ({BIND_AP_TIMEOUT} s)") from e
 
-            ack_packet = (seq + 1).to_bytes() + b"\x11\x00\x16"
+            ack_packet = build_bind_ap_ack_packet(len(packets))
             _LOGGER.debug("> %s", ack_packet.hex())
-            await client.write_gatt_char(COMMAND_UUID, packet, response=True)
+            await client.write_gatt_char(COMMAND_UUID, ack_packet, response=True)
 
             with suppress(BleakError):
                 await client.stop_notify(NOTIFICATION_UUID)
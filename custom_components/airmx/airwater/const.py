@@ -39,6 +39,15 @@ class AirWaterModel(StrEnum):
         return features
 
 
+# device type reported to the cloud on registration (genId)
+TYPE_CODE_MODELS: dict[int, AirWaterModel] = {
+    11: AirWaterModel.A5,
+    20: AirWaterModel.A3S,
+    21: AirWaterModel.A3S_V2,
+    30: AirWaterModel.A2,
+}
+
+
 class AirWaterCommand(IntEnum):
     CONTROL = 1000
     STATUS_INFO = 1001
@@ -0,0 +1,47 @@
+import dataclasses
+from enum import StrEnum
+
+HYSTERESIS = 2  # %
+PI_KP = 10  # % of the max fan speed per % of humidity error
+PI_KI = 1  # % of the max fan speed per % of humidity error per minute
+MAX_PI_STEP = 300  # seconds, longer gaps between readings are not integrated
+
+
+class AirWaterControllerType(StrEnum):
+    OFF = "off"
+    HYSTERESIS = "hysteresis"
+    PI = "pi"
+
+
+@dataclasses.dataclass
+class AirWaterHumidityController:
+    """Fan speed controller driven by a humidity reading, every update is O(1).
+
+    Hysteresis runs the fan at full speed below the target minus the band and stops it above the target plus the band.
+    PI scales the fan speed to the error and its integral, the integral is clamped to the output range.
+    """
+
+    type: AirWaterControllerType
+    max_speed: int
+
+    running: bool = False
+    integral: float = 0.0
+    updated_at: float | None = None
+
+    def update(self, humidity: float, target: float, now: float) -> int:
+        error = target - humidity
+
+        if self.type == AirWaterControllerType.HYSTERESIS:
+            if error >= HYSTERESIS:
+                self.running = True
+            elif error <= -HYSTERESIS:
+                self.running = False
+
+            return self.max_speed if self.running else 0
+
+        if self.updated_at is not None and 0 < (elapsed := now - self.updated_at) <= MAX_PI_STEP:
+            self.integral = min(max(self.integral + error * elapsed / 60, 0), 100 / PI_KI)
+
+        self.updated_at = now
+        output = min(max(PI_KP * error + PI_KI * self.integral, 0), 100)
+        return round(output / 100 * self.max_speed)
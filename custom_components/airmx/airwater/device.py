@@ -1,27 +1,42 @@
+import asyncio
+from collections import deque
 import dataclasses
 from datetime import datetime, timedelta
 import hashlib
 import json
 import logging
-from typing import Any, Callable, Optional, Self, TypeVar, cast
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Self, TypeVar, cast
 
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant
+from homeassistant.helpers.event import async_track_state_change_event, async_track_time_interval
 from homeassistant.helpers.storage import Store
 from homeassistant.util.json import json_loads_object
-import paho.mqtt.client as mqtt
 
+from ..governor import LoadGovernor
+from ..history import TelemetryHistory
 from ..mqtt.client import MQTTClient
-from .const import AirWaterCommand, AirWaterMode, AirWaterModel, WaterType
+from ..stats import AirWaterDeviceStats, MQTTClientStats
+from ..tracing import Trace, Tracer, trace_span
+from .const import AirWaterCommand, AirWaterFeature, AirWaterMode, AirWaterModel, WaterType
+from .controller import AirWaterControllerType, AirWaterHumidityController
+from .usage import AirWaterUsage, AirWaterUsageStore
+
+if TYPE_CHECKING:
+    import paho.mqtt.client as mqtt
 
 _LOGGER = logging.getLogger(__name__)
 _T = TypeVar("_T", int, float)
 
 AVAILABILITY_TIMEOUT = timedelta(seconds=30)
+COMMAND_REPLY_TIMEOUT = 5
 UPDATE_INTERVAL = 600
 UPDATE_DURATION = 10
 NULL_VALUE = 99999
 STORAGE_VERSION = 1
+USAGE_SAVE_DELAY = 60
+CONTROLLER_MIN_INTERVAL = 30
 
 CommandData = dict[str, int | str]
 CommandType = dict[str, int | str | CommandData]
@@ -168,6 +183,20 @@ class AirWaterDeviceStatus:
 
         return status
 
+    @property
+    def humidity(self) -> float | None:
+        if self.remote_sensor_online:
+            return self.remote_sensor_humidity
+
+        return self.internal_sensor_humidity
+
+    @property
+    def temperature(self) -> float | None:
+        if self.remote_sensor_online:
+            return self.remote_sensor_temperature
+
+        return self.internal_sensor_temperature
+
     @property
     def as_command_data(self) -> CommandData:
         return {
@@ -182,10 +211,21 @@ class AirWaterDeviceStatus:
     def with_changes(self, **changes: Any) -> Self:
         return dataclasses.replace(self, **changes)
 
+    def changes_from(self, other: Self) -> dict[str, Any]:
+        return {
+            field.name: value
+            for field in dataclasses.fields(self)
+            if (value := getattr(self, field.name)) != getattr(other, field.name)
+        }
+
+
+AirWaterStatusListener = Callable[[int, dict[str, Any]], None]
+
 
 class AirWaterDevice:
     _settings: AirWaterDeviceSettings
     _unsub_subscribe_for_updates: CALLBACK_TYPE | None = None
+    _unsub_controller_source: CALLBACK_TYPE | None = None
 
     def __init__(
         self,
@@ -196,51 +236,192 @@ class AirWaterDevice:
         sign_key: str,
         mqtt_host: str,
         mqtt_port: int,
+        governor: LoadGovernor | None = None,
+        tracer: Tracer | None = None,
+        usage_store: AirWaterUsageStore | None = None,
+        mqtt_client: MQTTClient | None = None,
     ):
         self.id = device_id
         self.model = model
         self.last_state_report: dict[Any, dict[Any, Any]] = {}
+        self.stats = AirWaterDeviceStats()
+        self.history = TelemetryHistory()
+        self.usage = AirWaterUsage()
 
         self._hass = hass
-        self._mqttc = MQTTClient(hass, mqtt_host, mqtt_port, f"aw_{device_id}", sign_key)
-        self._mqttc.subscribe_topics = [f"airwater/01/0/1/1/{self.id}"]
-        self._mqttc.on_message = self._async_handle_mqtt_message
-        self._mqttc.on_connect = self._async_subscribe_for_updates
-        self._mqttc.on_disconnect = self._async_notify
+        # a shared client is owned by the hub, which routes the reports and connection events to the device
+        self._owns_mqttc = mqtt_client is None
+        if mqtt_client is None:
+            self._mqttc = MQTTClient(hass, mqtt_host, mqtt_port, f"aw_{device_id}", sign_key)
+            self._mqttc.subscribe_topics = [f"airwater/01/0/1/1/{self.id}"]
+            self._mqttc.on_message = self._async_handle_mqtt_message
+            self._mqttc.tracer = tracer
+            self._mqttc.on_connect = self._async_subscribe_for_updates
+            self._mqttc.on_disconnect = self._async_notify
+        else:
+            self._mqttc = mqtt_client
         self._sign_key = sign_key
         self._status = AirWaterDeviceStatus()
         self._settings_store = settings_store
         self._listeners: list[Callable[[], None]] = []
+        self._status_listeners: list[AirWaterStatusListener] = []
         self._last_update: datetime | None = None
+        self._governor = governor
+        self._tracer = tracer
+        self._last_poll = 0.0
+        self._last_notify = 0.0
+        self._command_reply_deadline = 0.0
+        self._notify_handle: asyncio.TimerHandle | None = None
+        self._capture: deque[dict[str, Any]] | None = None
+        self._usage_store = usage_store
+        self._usage_saved_at = 0.0
+        self._controller: AirWaterHumidityController | None = None
+        self._controller_source: str | None = None
+        self._controller_commanded_at = 0.0
+
+        self.controller_interval = CONTROLLER_MIN_INTERVAL
+        self.poll_interval = timedelta(seconds=UPDATE_DURATION)
 
     async def async_setup(self) -> None:
         self._settings = await self._async_load_settings()
-        await self._mqttc.async_connect()
-        self._unsub_subscribe_for_updates = async_track_time_interval(
-            self._hass, self._async_subscribe_for_updates, timedelta(seconds=UPDATE_DURATION)
-        )
+        if self._usage_store and (restored := await self._usage_store.async_load()):
+            self.usage = AirWaterUsage.from_dict(restored)
+
+    async def async_start(self) -> None:
+        if self._owns_mqttc:
+            await self._mqttc.async_connect()
+
+        self._start_polling()
+        await self._async_subscribe_for_updates()
+
+    async def async_reconfigure(self, model: AirWaterModel, poll_interval: timedelta) -> None:
+        """Apply settings that do not require a new MQTT connection."""
+        self.model = model
+
+        if poll_interval != self.poll_interval:
+            self.poll_interval = poll_interval
+            if self._unsub_subscribe_for_updates:
+                self._unsub_subscribe_for_updates()
+                self._start_polling()
+
         await self._async_subscribe_for_updates()
 
     async def async_stop(self, _: Event | None = None) -> None:
         if self._unsub_subscribe_for_updates:
             self._unsub_subscribe_for_updates()
 
-        await self._mqttc.async_disconnect()
+        if self._notify_handle:
+            self._notify_handle.cancel()
+
+        if self._unsub_controller_source:
+            self._unsub_controller_source()
+            self._unsub_controller_source = None
+
+        if self._owns_mqttc:
+            await self._mqttc.async_disconnect()
+
+    async def async_remove_stores(self) -> None:
+        """Remove the persisted settings and usage, their pending delayed saves are cancelled."""
+        await self._settings_store.async_remove()
+        if self._usage_store:
+            await self._usage_store.async_remove()
 
     @property
     def name(self) -> str:
         return f"{self.model.value} {self.id}"
 
+    @property
+    def connection_params(self) -> tuple[str, int, str]:
+        return self._mqttc.host, self._mqttc.port, self._sign_key
+
     @property
     def available(self) -> bool:
         if not self._mqttc.connected or not self._last_update:
             return False
 
-        if datetime.now() - self._last_update >= AVAILABILITY_TIMEOUT:
+        if datetime.now() - self._last_update >= max(AVAILABILITY_TIMEOUT, self.effective_poll_interval * 3):
             return False
 
         return True
 
+    @property
+    def effective_poll_interval(self) -> timedelta:
+        """Poll interval stretched according to the current event loop load."""
+        if self._governor:
+            return self.poll_interval * self._governor.poll_multiplier
+
+        return self.poll_interval
+
+    @property
+    def last_report_age(self) -> float | None:
+        if not self._last_update:
+            return None
+
+        return (datetime.now() - self._last_update).total_seconds()
+
+    @property
+    def owns_mqtt_client(self) -> bool:
+        """False when the MQTT client is shared with other devices of a hub."""
+        return self._owns_mqttc
+
+    @property
+    def mqtt_stats(self) -> MQTTClientStats:
+        return self._mqttc.stats
+
+    @property
+    def trace_sample_rate(self) -> float:
+        return self._mqttc.trace_sample_rate
+
+    @trace_sample_rate.setter
+    def trace_sample_rate(self, rate: float) -> None:
+        self._mqttc.trace_sample_rate = rate
+
+    @property
+    def capture_size(self) -> int:
+        if self._capture is None:
+            return 0
+
+        return self._capture.maxlen or 0
+
+    @capture_size.setter
+    def capture_size(self, size: int) -> None:
+        if size != self.capture_size:
+            self._capture = deque(self._capture or (), maxlen=size) if size else None
+
+    @property
+    def capture(self) -> list[dict[str, Any]]:
+        """Return the last raw frames, oldest first."""
+        return list(self._capture or ())
+
+    @property
+    def controller(self) -> AirWaterHumidityController | None:
+        return self._controller
+
+    def set_controller(self, controller_type: AirWaterControllerType, source: str | None = None) -> None:
+        """Regulate the fan speed from the device humidity or from the state of the source entity."""
+        max_speed = 7 if self.model.features & AirWaterFeature.FAN_SPEED_STEPS else 100
+        if (
+            self._controller
+            and self._controller_source == source
+            and (self._controller.type, self._controller.max_speed) == (controller_type, max_speed)
+        ):
+            return
+
+        if self._unsub_controller_source:
+            self._unsub_controller_source()
+            self._unsub_controller_source = None
+
+        self._controller_source = source
+        if controller_type == AirWaterControllerType.OFF:
+            self._controller = None
+            return
+
+        self._controller = AirWaterHumidityController(controller_type, max_speed)
+        if source:
+            self._unsub_controller_source = async_track_state_change_event(
+                self._hass, source, self._async_handle_controller_source
+            )
+
     @property
     def status(self) -> AirWaterDeviceStatus:
         return self._status
@@ -293,10 +474,28 @@ class AirWaterDevice:
         await self._async_subscribe_for_updates()
 
     async def async_send_command(self, command: AirWaterCommand, data: CommandData) -> None:
-        await self._mqttc.async_publish(
-            f"airwater/01/1/0/1/{self.id}",
-            self._get_signed_command(command, data),
-        )
+        if command != AirWaterCommand.GET_STATUS:
+            self._command_reply_deadline = time.monotonic() + COMMAND_REPLY_TIMEOUT
+
+        payload = self._get_signed_command(command, data)
+        if self._capture is None:
+            await self._mqttc.async_publish(f"airwater/01/1/0/1/{self.id}", payload)
+            return
+
+        frame = self._capture_frame("out", payload)
+        started_at = time.perf_counter()
+        await self._mqttc.async_publish(f"airwater/01/1/0/1/{self.id}", payload)
+        frame["duration"] = time.perf_counter() - started_at
+
+    async def async_handle_mqtt_message(self, message: "mqtt.MQTTMessage", trace: Trace | None = None) -> None:
+        """Handle a report received by a shared MQTT client."""
+        await self._async_handle_mqtt_message(message, trace)
+
+    async def async_handle_mqtt_connect(self) -> None:
+        await self._async_subscribe_for_updates()
+
+    async def async_handle_mqtt_disconnect(self) -> None:
+        await self._async_notify()
 
     def async_add_listener(self, cb: Callable[[], None]) -> Callable[[], None]:
         """Add a listener to notify when data is updated."""
@@ -307,25 +506,89 @@ class AirWaterDevice:
         self._listeners.append(cb)
         return unsub
 
-    async def _async_handle_mqtt_message(self, message: mqtt.MQTTMessage) -> None:
-        state_report = cast(CommandType, json_loads_object(cast(bytes, message.payload)))
+    def async_add_status_listener(self, cb: AirWaterStatusListener) -> Callable[[], None]:
+        """Add a listener to receive changed status fields as soon as a report is decoded."""
+
+        def unsub() -> None:
+            self._status_listeners.remove(cb)
+
+        self._status_listeners.append(cb)
+        return unsub
+
+    async def _async_handle_mqtt_message(self, message: "mqtt.MQTTMessage", trace: Trace | None = None) -> None:
+        started_at = time.perf_counter()
+        frame = self._capture_frame("in", message.payload) if self._capture is not None else None
+        if trace:
+            trace.add_span("loop.handoff", trace.handed_off_at, time.time_ns())
+
+        with trace_span(trace, "json.decode"):
+            state_report = cast(CommandType, json_loads_object(cast(bytes, message.payload)))
+
+        self.stats.decode_time.add(time.perf_counter() - started_at)
+
         self._last_update = datetime.now()
         self.last_state_report[state_report["cmdId"]] = state_report
+        self.stats.messages_received[cast(int, state_report["cmdId"])] += 1
 
         match state_report["cmdId"]:
             case AirWaterCommand.STATUS_INFO:
-                await self._async_handle_new_status(cast(CommandData, state_report["data"]))
+                await self._async_handle_new_status(cast(CommandData, state_report["data"]), trace)
             case AirWaterCommand.SET_INFO:
-                await self._async_handle_new_settings(cast(CommandData, state_report["data"]))
+                await self._async_handle_new_settings(cast(CommandData, state_report["data"]), trace)
             case _:
-                _LOGGER.error(f"Unknown command: {state_report['cmdId']}")
+                _LOGGER.error("Unknown command: %s", state_report["cmdId"])
 
-        await self._async_notify()
+        self._schedule_notify(trace)
+        if frame is not None:
+            frame["duration"] = time.perf_counter() - started_at
+
+        if trace and self._tracer:
+            self._tracer.async_finish(trace, device_id=self.id, cmd_id=cast(int, state_report["cmdId"]))
+
+    def _capture_frame(self, direction: str, payload: bytes) -> dict[str, Any]:
+        frame: dict[str, Any] = {
+            "direction": direction,
+            "time": time.time(),
+            "payload": payload.decode(errors="replace"),
+            "duration": None,
+        }
+        cast(deque[dict[str, Any]], self._capture).append(frame)
+        return frame
 
     async def _async_notify(self) -> None:
         """Notify all listeners that data has been updated."""
-        for listener in self._listeners:
-            listener()
+        self._notify_listeners()
+
+    def _notify_listeners(self, trace: Trace | None = None) -> None:
+        if self._notify_handle:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+
+        self._last_notify = time.monotonic()
+        started_at = time.perf_counter()
+        with trace_span(trace, "notify", listeners=len(self._listeners)):
+            for listener in self._listeners:
+                if trace:
+                    with trace.span(
+                        "entity.write", entity_id=getattr(getattr(listener, "__self__", None), "entity_id", None)
+                    ):
+                        listener()
+                else:
+                    listener()
+
+        self.stats.notify_time.add(time.perf_counter() - started_at)
+
+    def _schedule_notify(self, trace: Trace | None = None) -> None:
+        """Notify listeners about a report, holding notifications back while the event loop is overloaded."""
+        if self._notify_handle:
+            return
+
+        now = time.monotonic()
+        delay = self._last_notify + (self._governor.notify_interval if self._governor else 0) - now
+        if delay <= 0 or now < self._command_reply_deadline:
+            self._notify_listeners(trace)
+        else:
+            self._notify_handle = self._hass.loop.call_later(delay, self._notify_listeners)
 
     async def _async_control(self, new_status: AirWaterDeviceStatus) -> None:
         await self.async_send_command(AirWaterCommand.CONTROL, new_status.as_command_data)
@@ -333,26 +596,90 @@ class AirWaterDevice:
     async def _async_set(self, new_settings: AirWaterDeviceSettings) -> None:
         await self.async_send_command(AirWaterCommand.SET, new_settings.as_command_data)
 
+    async def _async_poll(self, _: datetime | None = None) -> None:
+        interval = self.effective_poll_interval
+        if interval != self.poll_interval:
+            # ticks keep the configured interval, skip them until the stretched one has passed
+            if time.monotonic() - self._last_poll < (interval - self.poll_interval / 2).total_seconds():
+                return
+
+        await self._async_subscribe_for_updates()
+
     async def _async_subscribe_for_updates(self, _: datetime | None = None) -> None:
         await self._async_notify()
 
         if self._mqttc.connected:
+            self._last_poll = time.monotonic()
             await self.async_send_command(
                 AirWaterCommand.GET_STATUS,
                 {
                     "cleanTime": self._settings.water_type.cleaning_time,
                     "water_type": int(self._settings.water_type),
                     "frequencyTime": UPDATE_INTERVAL,
-                    "durationTime": UPDATE_DURATION,
+                    # under load polls are skipped, the report window stays at the configured interval
+                    "durationTime": int(self.poll_interval.total_seconds()),
                 },
             )
 
-    async def _async_handle_new_status(self, data: CommandData) -> None:
-        self._status = AirWaterDeviceStatus.from_command_data(data)
-        await self._async_update_settings(self.settings.with_changes(target_humidity=self._status.target_humidity))
-
-    async def _async_handle_new_settings(self, data: CommandData) -> None:
-        await self._async_update_settings(self._settings.update_from_command_data(data))
+    def _start_polling(self) -> None:
+        self._unsub_subscribe_for_updates = async_track_time_interval(self._hass, self._async_poll, self.poll_interval)
+
+    async def _async_handle_new_status(self, data: CommandData, trace: Trace | None = None) -> None:
+        with trace_span(trace, "status.decode"):
+            status = AirWaterDeviceStatus.from_command_data(data)
+
+        if self._status_listeners and (changes := status.changes_from(self._status)):
+            for listener in self._status_listeners:
+                listener(self.id, changes)
+
+        self._status = status
+        self.history.add(status)
+        self._update_usage(status)
+        if self._controller and not self._controller_source:
+            await self._async_update_controller(status.humidity)
+        with trace_span(trace, "settings.update"):
+            await self._async_update_settings(self.settings.with_changes(target_humidity=self._status.target_humidity))
+
+    async def _async_handle_new_settings(self, data: CommandData, trace: Trace | None = None) -> None:
+        with trace_span(trace, "settings.update"):
+            await self._async_update_settings(self._settings.update_from_command_data(data))
+
+    async def _async_handle_controller_source(self, event: Event[EventStateChangedData]) -> None:
+        if (state := event.data["new_state"]) is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return
+
+        try:
+            humidity = float(state.state)
+        except ValueError:
+            return
+
+        await self._async_update_controller(humidity)
+
+    async def _async_update_controller(self, humidity: float | None) -> None:
+        """Drive the fan speed directly, sending at most one command per controller interval."""
+        if not self._controller or humidity is None or not self._status.power or not self._mqttc.connected:
+            return
+
+        now = time.monotonic()
+        speed = self._controller.update(humidity, self._settings.target_humidity, now)
+        if speed == self._status.fan_speed and self._status.mode == AirWaterMode.MANUAL:
+            return
+
+        if now - self._controller_commanded_at < self.controller_interval:
+            return
+
+        self._controller_commanded_at = now
+        _LOGGER.debug("%s: humidity %s, setting fan speed to %s", self.name, humidity, speed)
+        await self.async_set_fan_speed(speed)
+
+    def _update_usage(self, status: AirWaterDeviceStatus) -> None:
+        now = time.monotonic()
+        self.usage.update(status, now)
+
+        # the save is requested at most once per delay, otherwise every report would postpone it
+        if self._usage_store and now - self._usage_saved_at >= USAGE_SAVE_DELAY:
+            self._usage_saved_at = now
+            self._usage_store.async_delay_save(self.usage.as_dict, USAGE_SAVE_DELAY)
 
     async def _async_update_settings(self, settings: AirWaterDeviceSettings) -> None:
         if self._settings != settings:
@@ -0,0 +1,81 @@
+import dataclasses
+import math
+from typing import TYPE_CHECKING, Any, Self
+
+from homeassistant.helpers.storage import Store
+
+if TYPE_CHECKING:
+    from .device import AirWaterDeviceStatus
+
+CONSUMPTION_TIME_CONSTANT = 3600  # seconds
+MAX_REPORT_GAP = 300  # longer gaps between reports are not accounted
+MIN_CONSUMPTION = 0.1  # %/h, below it the time until empty is unknown
+
+AirWaterUsageStoreData = dict[str, float]
+
+
+class AirWaterUsageStore(Store[AirWaterUsageStoreData]):
+    pass
+
+
+@dataclasses.dataclass
+class AirWaterUsage:
+    """Streaming estimates updated in O(1) per status report.
+
+    Water consumption is an exponentially weighted rate of water level drops, refills are not accounted.
+    Runtimes accumulate the time between reports during which the previous report had the heater or fan running.
+    """
+
+    water_consumption: float = 0.0  # %/h
+    water_used: float = 0.0  # % of the tank
+    heater_runtime: float = 0.0  # seconds
+    fan_runtime: float = 0.0  # seconds
+
+    water_level: float | None = None
+    heater: bool = False
+    fan: bool = False
+    updated_at: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        return cls(
+            water_consumption=float(data.get("water_consumption", 0)),
+            water_used=float(data.get("water_used", 0)),
+            heater_runtime=float(data.get("heater_runtime", 0)),
+            fan_runtime=float(data.get("fan_runtime", 0)),
+        )
+
+    def as_dict(self) -> AirWaterUsageStoreData:
+        return {
+            "water_consumption": self.water_consumption,
+            "water_used": self.water_used,
+            "heater_runtime": self.heater_runtime,
+            "fan_runtime": self.fan_runtime,
+        }
+
+    @property
+    def time_to_empty(self) -> float | None:
+        """Predicted number of seconds until the tank is empty."""
+        if self.water_level is None or self.water_consumption < MIN_CONSUMPTION:
+            return None
+
+        return self.water_level / self.water_consumption * 3600
+
+    def update(self, status: "AirWaterDeviceStatus", now: float) -> None:
+        if self.updated_at is not None and 0 < (elapsed := now - self.updated_at) <= MAX_REPORT_GAP:
+            if self.heater:
+                self.heater_runtime += elapsed
+            if self.fan:
+                self.fan_runtime += elapsed
+
+            if self.water_level is not None and status.water_level is not None:
+                drop = self.water_level - status.water_level
+                if drop >= 0:
+                    self.water_used += drop
+                    alpha = 1 - math.exp(-elapsed / CONSUMPTION_TIME_CONSTANT)
+                    self.water_consumption += alpha * (drop / elapsed * 3600 - self.water_consumption)
+
+        self.water_level = status.water_level
+        self.heater = status.heater
+        self.fan = status.power and status.fan_speed > 0
+        self.updated_at = now
@@ -0,0 +1,134 @@
+from array import array
+from dataclasses import dataclass, field
+from datetime import timedelta
+import math
+from typing import Callable, Iterable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .airwater.device import AirWaterDevice
+
+FLEET_UPDATE_INTERVAL = timedelta(seconds=60)
+BELOW_TARGET_MARGIN = 2  # %
+SENSOR_DISAGREEMENT_THRESHOLD = 5  # %
+MIN_DRAIN_SPAN = 600  # seconds of history required to estimate the drain rate
+TOP_DEVICES = 5
+
+
+@dataclass
+class FleetSnapshot:
+    """Current values and history columns of all devices, copied on the event loop."""
+
+    names: list[str] = field(default_factory=list)
+    humidity: list[float] = field(default_factory=list)
+    target_humidity: list[float] = field(default_factory=list)
+    internal_humidity: list[float] = field(default_factory=list)
+    remote_humidity: list[float] = field(default_factory=list)
+    times: list[array] = field(default_factory=list)
+    water_levels: list[array] = field(default_factory=list)
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[AirWaterDevice]) -> "FleetSnapshot":
+        def _value(value: float | None) -> float:
+            return math.nan if value is None else value
+
+        snapshot = cls()
+        for device in devices:
+            status = device.status
+            times, values = device.history.columns()
+            snapshot.names.append(device.name)
+            snapshot.humidity.append(_value(status.humidity))
+            snapshot.target_humidity.append(status.target_humidity or math.nan)
+            snapshot.internal_humidity.append(_value(status.internal_sensor_humidity))
+            snapshot.remote_humidity.append(
+                _value(status.remote_sensor_humidity) if status.remote_sensor_online else math.nan
+            )
+            snapshot.times.append(times)
+            snapshot.water_levels.append(values["water_level"])
+
+        return snapshot
+
+
+@dataclass
+class FleetStats:
+    below_target: dict[str, float] = field(default_factory=dict)
+    water_drain: dict[str, float] = field(default_factory=dict)
+    sensor_disagreement: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def max_water_drain(self) -> float | None:
+        return max(self.water_drain.values(), default=None)
+
+
+def compute_fleet_stats(snapshot: FleetSnapshot) -> FleetStats:
+    """Compute the fleet statistics with array operations over all devices at once."""
+    import numpy as np
+
+    stats = FleetStats()
+    if not snapshot.names:
+        return stats
+
+    names = np.array(snapshot.names, dtype=object)
+
+    # devices whose humidity stays below the target
+    deficit = np.array(snapshot.target_humidity) - np.array(snapshot.humidity)
+    below = deficit > BELOW_TARGET_MARGIN
+    stats.below_target = dict(zip(names[below], np.round(deficit[below], 1).tolist()))
+
+    # water drain rate: sum of level drops over the covered time, refills are ignored
+    water = np.vstack([np.frombuffer(levels, dtype=np.float32) for levels in snapshot.water_levels]).astype(np.float64)
+    times = np.vstack([np.frombuffer(t, dtype=np.float64) for t in snapshot.times])
+    times = np.where(np.isnan(water), np.nan, times)
+    used = np.nansum(np.clip(-np.diff(water, axis=1), 0, None), axis=1)
+    span = np.fmax.reduce(times, axis=1) - np.fmin.reduce(times, axis=1)
+    rate = np.divide(used * 3600, span, out=np.zeros_like(used), where=span >= MIN_DRAIN_SPAN)
+    order = np.argsort(-rate)[:TOP_DEVICES]
+    order = order[rate[order] > 0]
+    stats.water_drain = dict(zip(names[order], np.round(rate[order], 1).tolist()))
+
+    # remote sensor readings far from the internal one
+    delta = np.array(snapshot.remote_humidity) - np.array(snapshot.internal_humidity)
+    disagree = np.abs(delta) > SENSOR_DISAGREEMENT_THRESHOLD
+    stats.sensor_disagreement = dict(zip(names[disagree], np.round(delta[disagree], 1).tolist()))
+
+    return stats
+
+
+class FleetAnalytics:
+    """Refresh the fleet statistics on a fixed cadence, the computation runs in the executor."""
+
+    def __init__(self, hass: HomeAssistant, devices: Callable[[], Iterable[AirWaterDevice]]):
+        self._hass = hass
+        self._devices = devices
+        self._listeners: list[Callable[[], None]] = []
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+        self.stats = FleetStats()
+
+    async def async_start(self) -> None:
+        self._unsub_refresh = async_track_time_interval(self._hass, self.async_refresh, FLEET_UPDATE_INTERVAL)
+        await self.async_refresh()
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    @callback
+    def async_add_listener(self, cb: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener to notify when the statistics are refreshed."""
+
+        def unsub() -> None:
+            self._listeners.remove(cb)
+
+        self._listeners.append(cb)
+        return unsub
+
+    async def async_refresh(self, *_: object) -> None:
+        snapshot = FleetSnapshot.from_devices(self._devices())
+        self.stats = await self._hass.async_add_executor_job(compute_fleet_stats, snapshot)
+
+        for listener in self._listeners:
+            listener()
@@ -9,8 +9,8 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .airwater.device import AirWaterDevice
-from .const import ATTR_MALFUNCTION, ATTR_NEED_CLEANING, ATTR_UV, DEVICES, DOMAIN
-from .entity import AirWaterEntity
+from .const import ATTR_MALFUNCTION, ATTR_NEED_CLEANING, ATTR_UV
+from .entity import AirWaterEntity, async_setup_device_entities
 
 BINARY_SENSOR_TYPES = (
     BinarySensorEntityDescription(
@@ -42,13 +42,11 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
-    entities: list[BinarySensorEntity] = []
+    async_setup_device_entities(hass, entry, async_add_entities, _get_entities)
 
-    for description in BINARY_SENSOR_TYPES:
-        entities.append(AirWaterGenericBinarySensor(device, entry, description))
 
-    async_add_entities(entities)
+def _get_entities(device: AirWaterDevice, entry: ConfigEntry) -> list[BinarySensorEntity]:
+    return [AirWaterGenericBinarySensor(device, entry, description) for description in BINARY_SENSOR_TYPES]
 
 
 class AirWaterGenericBinarySensor(AirWaterEntity, BinarySensorEntity):
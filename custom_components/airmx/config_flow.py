@@ -1,59 +1,71 @@
-from dataclasses import dataclass
+import asyncio
 import logging
-from typing import Self
-
-from bleak import BLEDevice
-from homeassistant.components import bluetooth
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_DEVICE, CONF_ID, CONF_MODEL, CONF_PASSWORD
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.config_entries import (
+    SOURCE_IMPORT,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlowWithConfigEntry,
+)
+from homeassistant.const import CONF_DEVICE, CONF_DEVICES, CONF_ID, CONF_MODEL, CONF_PASSWORD, CONF_TYPE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import section
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.device_registry import format_mac
-from homeassistant.helpers.selector import SelectOptionDict, SelectSelector, SelectSelectorConfig, SelectSelectorMode
+from homeassistant.helpers.selector import (
+    BooleanSelector,
+    EntitySelector,
+    EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 from homeassistant.helpers.typing import ConfigType
 import voluptuous as vol
 
-from .airwater.ble import AirWaterBLEConnector
 from .airwater.const import AirWaterModel
-from .const import CONF_MQTT_HOST, CONF_MQTT_PORT, CONF_SIGN_KEY, CONF_SSID, DOMAIN
+from .airwater.controller import AirWaterControllerType
+from .airwater.device import CONTROLLER_MIN_INTERVAL
+from .const import (
+    CONF_CAPTURE_SIZE,
+    CONF_CONTROLLER,
+    CONF_CONTROLLER_INTERVAL,
+    CONF_CONTROLLER_SOURCE,
+    CONF_DEADBAND,
+    CONF_GROUP_BY_AREA,
+    CONF_MIN_INTERVAL,
+    CONF_MQTT_HOST,
+    CONF_MQTT_PORT,
+    CONF_POLL_INTERVAL,
+    CONF_SIGN_KEY,
+    CONF_SSID,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_DEADBAND,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    ENTRY_TYPE_HUB,
+    FILTERED_SENSORS,
+)
+from .discovery import (
+    ADDON_HOSTNAME,
+    AirWaterBLEDevice,
+    AirWaterDeviceInfo,
+    AirWaterDiscovery,
+    async_discover_ble_devices,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-ADDON_HOSTNAME = "a06532c7-airmx-addon"
 DEFAULT_MQTT_PORT = 1883
-
-
-@dataclass
-class AirWaterBLEDevice:
-    model: AirWaterModel
-    device: BLEDevice
-
-    @property
-    def name(self) -> str:
-        return self.device.name or ""
-
-    @property
-    def address(self) -> str:
-        return self.device.address
-
-
-@dataclass
-class AirWaterDeviceInfo:
-    id: int
-    ble_mac: str
-    sign_key: str
-    model: AirWaterModel | None = None
-
-    @classmethod
-    def from_dict(cls, data: ConfigType) -> Self:
-        return cls(id=data["id"], sign_key=data["key"], ble_mac=format_mac(data["ble_mac"]).upper())
-
-    @property
-    def name(self) -> str:
-        if self.model:
-            return f"{self.ble_mac} ({self.model.human_readable})"
-
-        return self.ble_mac
+BULK_IMPORT_PARALLELISM = 4
 
 
 class FlowHandler(ConfigFlow, domain=DOMAIN):
@@ -62,8 +74,15 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
         self._wifi_devices: dict[int, AirWaterDeviceInfo] = {}
         self._ble_devices: dict[str, AirWaterBLEDevice] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> "OptionsFlowHandler":
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
-        return self.async_show_menu(step_id="user", menu_options=["select_device", "manual", "bind_ap"])
+        return self.async_show_menu(
+            step_id="user", menu_options=["select_device", "bulk", "manual", "bind_ap", "hub", "fleet"]
+        )
 
     async def async_step_select_device(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
         if user_input is not None:
@@ -77,7 +96,9 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
             _LOGGER.exception(e)
             return self.async_abort(reason="addon_connection_error")
 
-        if not self._wifi_devices:
+        hub_device_ids = self._hub_device_ids
+        devices = [device for device in self._wifi_devices.values() if device.id not in hub_device_ids]
+        if not devices:
             return self.async_show_form(step_id="select_device", errors={"base": "device_not_found"})
 
         schema = vol.Schema(
@@ -85,10 +106,7 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_ID): SelectSelector(
                     SelectSelectorConfig(
                         mode=SelectSelectorMode.LIST,
-                        options=[
-                            SelectOptionDict(value=str(device.id), label=device.name)
-                            for device in self._wifi_devices.values()
-                        ],
+                        options=[SelectOptionDict(value=str(device.id), label=device.name) for device in devices],
                     ),
                 )
             }
@@ -101,14 +119,7 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
             device.model = AirWaterModel(user_input[CONF_MODEL])
 
         if device.model:
-            self._data.update(
-                {
-                    CONF_MODEL: device.model,
-                    CONF_SIGN_KEY: device.sign_key,
-                    CONF_MQTT_HOST: ADDON_HOSTNAME,
-                    CONF_MQTT_PORT: DEFAULT_MQTT_PORT,
-                }
-            )
+            self._data.update(_get_entry_data(device, device.model))
             return self._create_or_update_config_entry(self._data)
 
         schema = vol.Schema({vol.Required(CONF_MODEL): self._model_selector})
@@ -118,6 +129,91 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
             description_placeholders={"device": device.name},
         )
 
+    async def async_step_bulk(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        try:
+            await self._async_discover_wifi_devices()
+        except Exception as e:
+            _LOGGER.exception(e)
+            return self.async_abort(reason="addon_connection_error")
+
+        configured_ids = {entry.data.get(CONF_ID) for entry in self._async_current_entries()} | self._hub_device_ids
+        devices = {device.id: device for device in self._wifi_devices.values() if device.id not in configured_ids}
+        if not devices:
+            return self.async_abort(reason="no_new_devices")
+
+        errors = {}
+        if user_input is not None:
+            selected = [devices[int(device_id)] for device_id in user_input[CONF_DEVICES]]
+            default_model = user_input.get(CONF_MODEL)
+            if not selected:
+                errors["base"] = "no_devices_selected"
+            elif any(device.model is None for device in selected) and not default_model:
+                errors[CONF_MODEL] = "model_required"
+            else:
+                entries_data = [
+                    _get_entry_data(device, device.model or AirWaterModel(default_model)) for device in selected
+                ]
+                self.hass.async_create_background_task(
+                    _async_import_devices(self.hass, entries_data), f"{DOMAIN}_bulk_import"
+                )
+                return self.async_abort(reason="bulk_added", description_placeholders={"count": str(len(selected))})
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_DEVICES, default=[str(device_id) for device_id in devices]): SelectSelector(
+                    SelectSelectorConfig(
+                        mode=SelectSelectorMode.LIST,
+                        multiple=True,
+                        options=[
+                            SelectOptionDict(value=str(device.id), label=f"{device.id}: {device.name}")
+                            for device in devices.values()
+                        ],
+                    ),
+                ),
+                vol.Optional(CONF_MODEL): self._model_selector,
+            }
+        )
+        return self.async_show_form(step_id="bulk", data_schema=schema, errors=errors)
+
+    async def async_step_integration_discovery(self, discovery_info: ConfigType) -> ConfigFlowResult:
+        device_id = discovery_info[CONF_ID]
+        await self.async_set_unique_id(f"airwater_{device_id}")
+        self._abort_if_unique_id_configured()
+        if device_id in self._hub_device_ids or any(
+            entry.data.get(CONF_ID) == device_id for entry in self._async_current_entries()
+        ):
+            return self.async_abort(reason="already_configured")
+
+        self._data.update(discovery_info)
+        self.context["title_placeholders"] = {"id": str(device_id)}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        if user_input is not None:
+            return self._create_or_update_config_entry({**self._data, **user_input})
+
+        model: AirWaterModel | None = None
+        sign_key: str | None = None
+        if (result := AirWaterDiscovery.async_get(self.hass).cached_result) and (
+            device := result.wifi_devices.get(self._data[CONF_ID])
+        ):
+            model, sign_key = device.model, device.sign_key
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_MODEL, description={"suggested_value": model}): self._model_selector,
+                vol.Required(CONF_SIGN_KEY, description={"suggested_value": sign_key}): cv.string,
+            }
+        )
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            data_schema=schema,
+            description_placeholders={"id": str(self._data[CONF_ID])},
+        )
+
+    async def async_step_import(self, import_data: ConfigType) -> ConfigFlowResult:
+        return self._create_or_update_config_entry(import_data)
+
     async def async_step_manual(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
         if user_input is not None:
             return self._create_or_update_config_entry(user_input)
@@ -139,7 +235,7 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
                 self._data[CONF_DEVICE] = device
                 return await self.async_step_bind_ap_confirm()
 
-        self._discover_ble_devices()
+        self._ble_devices.update(async_discover_ble_devices(self.hass))
 
         if not self._ble_devices:
             return self.async_show_form(step_id="bind_ap", errors={"base": "device_not_found"})
@@ -160,12 +256,20 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(step_id="bind_ap", data_schema=schema)
 
     async def async_step_bind_ap_confirm(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        errors = {}
         if user_input is not None:
-            device = self._ble_devices[self._data[CONF_DEVICE]]
+            from .airwater.ble import AirWaterBindAPError, AirWaterBindAPTimeout, AirWaterBLEConnector
 
-            await AirWaterBLEConnector().bind_ap(device.device, user_input[CONF_SSID], user_input[CONF_PASSWORD])
+            device = self._ble_devices[self._data[CONF_DEVICE]]
 
-            return self.async_abort(reason="bind_ap_done")
+            try:
+                await AirWaterBLEConnector().bind_ap(device.device, user_input[CONF_SSID], user_input[CONF_PASSWORD])
+                return self.async_abort(reason="bind_ap_done")
+            except AirWaterBindAPTimeout:
+                errors["base"] = "bind_ap_timeout"
+            except AirWaterBindAPError as e:
+                _LOGGER.error(e)
+                errors["base"] = "bind_ap_failed"
 
         schema = vol.Schema(
             {
@@ -173,9 +277,41 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): cv.string,
             }
         )
-        return self.async_show_form(step_id="bind_ap_confirm", data_schema=schema)
+        return self.async_show_form(step_id="bind_ap_confirm", data_schema=schema, errors=errors)
+
+    async def async_step_hub(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        # the device list comes from the addon, so the hub is bound to the addon broker
+        await self.async_set_unique_id(ENTRY_TYPE_HUB)
+        self._abort_if_unique_id_configured()
+
+        if user_input is not None:
+            return self.async_create_entry(
+                title="AIRMX hub",
+                data={
+                    CONF_TYPE: ENTRY_TYPE_HUB,
+                    CONF_MQTT_HOST: ADDON_HOSTNAME,
+                    CONF_MQTT_PORT: DEFAULT_MQTT_PORT,
+                    CONF_DEVICES: [],
+                },
+            )
+
+        return self.async_show_form(step_id="hub")
+
+    async def async_step_fleet(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        await self.async_set_unique_id(ENTRY_TYPE_FLEET)
+        self._abort_if_unique_id_configured()
+
+        if user_input is not None:
+            return self.async_create_entry(title="AIRMX fleet", data={CONF_TYPE: ENTRY_TYPE_FLEET})
+
+        return self.async_show_form(step_id="fleet")
 
     #
+    @property
+    def _hub_device_ids(self) -> set[int]:
+        """Devices managed by the hub entry, they can't get an entry of their own."""
+        return {data[CONF_ID] for entry in self._async_current_entries() for data in entry.data.get(CONF_DEVICES, [])}
+
     @property
     def _model_selector(self) -> SelectSelector:
         return SelectSelector(
@@ -189,31 +325,119 @@ class FlowHandler(ConfigFlow, domain=DOMAIN):
         title = f"{data[CONF_MODEL]}: {data[CONF_ID]}"
 
         for entry in self.hass.config_entries.async_entries(DOMAIN):
-            if entry.data[CONF_ID] == data[CONF_ID]:
+            if entry.data.get(CONF_ID) == data[CONF_ID]:
                 self.hass.config_entries.async_update_entry(entry, title=title, data=data)
                 return self.async_abort(reason="updated_entry")
 
         return self.async_create_entry(title=title, data=data)
 
-    def _discover_ble_devices(self) -> None:
-        for ble_device in bluetooth.async_get_scanner(self.hass).discovered_devices:
-            if ble_device.name is not None:
-                try:
-                    device = AirWaterBLEDevice(model=AirWaterModel(ble_device.name), device=ble_device)
-                    self._ble_devices[device.address] = device
-                except ValueError:
-                    pass
-
     async def _async_discover_wifi_devices(self) -> None:
-        self._discover_ble_devices()
+        result = await AirWaterDiscovery.async_get(self.hass).async_discover()
+        self._ble_devices.update(result.ble_devices)
+        self._wifi_devices.update(result.wifi_devices)
+        if result.addon_error:
+            raise result.addon_error
+
 
-        http = async_get_clientsession(self.hass)
-        response = await http.get(f"http://{ADDON_HOSTNAME}/_devices")
-        response.raise_for_status()
-        for data in await response.json():
-            device = AirWaterDeviceInfo.from_dict(data)
+def _get_entry_data(device: AirWaterDeviceInfo, model: AirWaterModel) -> ConfigType:
+    return {
+        CONF_ID: device.id,
+        CONF_MODEL: model,
+        CONF_SIGN_KEY: device.sign_key,
+        CONF_MQTT_HOST: ADDON_HOSTNAME,
+        CONF_MQTT_PORT: DEFAULT_MQTT_PORT,
+    }
 
-            if ble_device := self._ble_devices.get(device.ble_mac):
-                device.model = ble_device.model
 
-            self._wifi_devices[device.id] = device
+async def _async_import_devices(hass: HomeAssistant, entries_data: list[ConfigType]) -> None:
+    """Create the config entries of many devices, setting up a limited number of them at once."""
+    semaphore = asyncio.Semaphore(BULK_IMPORT_PARALLELISM)
+
+    async def _async_import(data: ConfigType) -> None:
+        async with semaphore:
+            try:
+                await hass.config_entries.flow.async_init(DOMAIN, context={"source": SOURCE_IMPORT}, data=data)
+            except Exception as e:
+                _LOGGER.error("Failed to add device %d: %r", data[CONF_ID], e)
+
+    await asyncio.gather(*(_async_import(data) for data in entries_data))
+
+
+class OptionsFlowHandler(OptionsFlowWithConfigEntry):
+    async def async_step_init(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        if self.config_entry.data.get(CONF_TYPE) == ENTRY_TYPE_FLEET:
+            return await self.async_step_fleet()
+
+        if user_input is not None:
+            self.options.pop(CONF_CONTROLLER_SOURCE, None)
+            self.options.update(user_input)
+            return self.async_create_entry(data=self.options)
+
+        schema: dict[vol.Marker, Any] = {
+            vol.Required(
+                CONF_POLL_INTERVAL, default=self.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+            ): NumberSelector(
+                NumberSelectorConfig(min=5, max=600, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX)
+            ),
+            vol.Required(CONF_TRACE_SAMPLE_RATE, default=self.options.get(CONF_TRACE_SAMPLE_RATE, 0)): NumberSelector(
+                NumberSelectorConfig(min=0, max=1, step=0.01, mode=NumberSelectorMode.BOX)
+            ),
+            vol.Required(CONF_CAPTURE_SIZE, default=self.options.get(CONF_CAPTURE_SIZE, 0)): NumberSelector(
+                NumberSelectorConfig(min=0, max=1000, step=1, mode=NumberSelectorMode.BOX)
+            ),
+            vol.Required(
+                CONF_CONTROLLER, default=self.options.get(CONF_CONTROLLER, AirWaterControllerType.OFF)
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    mode=SelectSelectorMode.DROPDOWN,
+                    options=list(AirWaterControllerType),
+                    translation_key=CONF_CONTROLLER,
+                )
+            ),
+            vol.Optional(
+                CONF_CONTROLLER_SOURCE,
+                description={"suggested_value": self.options.get(CONF_CONTROLLER_SOURCE)},
+            ): EntitySelector(EntitySelectorConfig(domain="sensor", device_class=SensorDeviceClass.HUMIDITY)),
+            vol.Required(
+                CONF_CONTROLLER_INTERVAL, default=self.options.get(CONF_CONTROLLER_INTERVAL, CONTROLLER_MIN_INTERVAL)
+            ): NumberSelector(
+                NumberSelectorConfig(min=5, max=600, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX)
+            ),
+        }
+        for key in FILTERED_SENSORS:
+            sensor_options = self.options.get(key, {})
+            schema[vol.Required(key)] = section(
+                vol.Schema(
+                    {
+                        vol.Required(
+                            CONF_DEADBAND,
+                            default=sensor_options.get(CONF_DEADBAND, DEFAULT_DEADBAND.get(key, 0)),
+                        ): NumberSelector(NumberSelectorConfig(min=0, step="any", mode=NumberSelectorMode.BOX)),
+                        vol.Required(
+                            CONF_MIN_INTERVAL,
+                            default=sensor_options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL.get(key, 0)),
+                        ): NumberSelector(
+                            NumberSelectorConfig(
+                                min=0, max=86400, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+                            )
+                        ),
+                    }
+                ),
+                {"collapsed": True},
+            )
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
+
+    async def async_step_fleet(self, user_input: ConfigType | None = None) -> ConfigFlowResult:
+        if user_input is not None:
+            self.options.update(user_input)
+            return self.async_create_entry(data=self.options)
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_GROUP_BY_AREA, default=self.options.get(CONF_GROUP_BY_AREA, False)
+                ): BooleanSelector(),
+            }
+        )
+        return self.async_show_form(step_id="fleet", data_schema=schema)
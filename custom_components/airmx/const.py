@@ -1,4 +1,4 @@
-from homeassistant.const import Platform
+from homeassistant.const import ATTR_TEMPERATURE, Platform
 
 DOMAIN = "airmx"
 
@@ -10,33 +10,101 @@ PLATFORMS = [
     Platform.SENSOR,
     Platform.SWITCH,
 ]
+FLEET_PLATFORMS = [Platform.SENSOR]
+
+ENTRY_TYPE_FLEET = "fleet"
+ENTRY_TYPE_HUB = "hub"
+AGGREGATES = "aggregates"
+MQTT_DISCOVERY = "mqtt_discovery"
+HUBS = "hubs"
 
 DEVICES = "devices"
 SETTING_STORES = "settings_stores"
+SETUP_TIMES = "setup_times"
+GOVERNOR = "governor"
+GOVERNOR_SENSOR_HOSTS = "governor_sensor_hosts"
+TRACER = "tracer"
+FLEET = "fleet"
+START_SEMAPHORE = "start_semaphore"
+START_TASKS = "start_tasks"
+
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+
+MAX_PARALLEL_STARTS = 4
+
+SIGNAL_DEVICE_ADDED = f"{DOMAIN}_device_added"
+SIGNAL_DEVICE_REMOVED = f"{DOMAIN}_device_removed"
 
 CONF_MQTT_HOST = "mqtt_host"
 CONF_MQTT_PORT = "mqtt_port"
 CONF_SIGN_KEY = "sign_key"
 CONF_SSID = "ssid"
+CONF_DEADBAND = "deadband"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+CONF_CAPTURE_SIZE = "capture_size"
+CONF_GROUP_BY_AREA = "group_by_area"
+CONF_CONTROLLER = "controller"
+CONF_CONTROLLER_SOURCE = "controller_source"
+CONF_CONTROLLER_INTERVAL = "controller_interval"
+
+DEFAULT_POLL_INTERVAL = 10
 
 ATTR_ANION = "anion"
+ATTR_AREA_AVERAGE_HUMIDITY = "area_average_humidity"
+ATTR_AREA_NEED_CLEANING = "area_need_cleaning"
+ATTR_AREA_NEED_REFILL = "area_need_refill"
 ATTR_CHILD_LOCK = "child_lock"
 ATTR_COMMAND = "command"
+ATTR_DECODE_TIME = "decode_time"
+ATTR_DEVICES = "devices"
+ATTR_FAN_RUNTIME = "fan_runtime"
 ATTR_FAN_SPEED = "fan_speed"
+ATTR_FLEET_AVERAGE_HUMIDITY = "fleet_average_humidity"
+ATTR_FLEET_BELOW_TARGET = "fleet_below_target"
+ATTR_FLEET_NEED_CLEANING = "fleet_need_cleaning"
+ATTR_FLEET_NEED_REFILL = "fleet_need_refill"
+ATTR_FLEET_SENSOR_DISAGREEMENT = "fleet_sensor_disagreement"
+ATTR_FLEET_WATER_DRAIN = "fleet_water_drain"
+ATTR_GOVERNOR_LEVEL = "governor_level"
 ATTR_HEATER = "heater"
+ATTR_HEATER_RUNTIME = "heater_runtime"
 ATTR_HUMIDITY = "humidity"
+ATTR_LAST_REPORT_AGE = "last_report_age"
+ATTR_LOOP_LAG = "loop_lag"
 ATTR_MALFUNCTION = "malfunction"
+ATTR_MESSAGES_RECEIVED = "messages_received"
 ATTR_NEED_CLEANING = "need_cleaning"
+ATTR_NOTIFY_TIME = "notify_time"
 ATTR_PROXIMITY_SENSOR = "proximity_sensor"
+ATTR_PUBLISH_LATENCY = "publish_latency"
+ATTR_RECONNECTS = "reconnects"
 ATTR_REMOTE_SENSOR_RSSI = "remote_sensor_rssi"
 ATTR_STATUS = "status"
+ATTR_TIME_TO_EMPTY = "time_to_empty"
 ATTR_UV = "uv"
+ATTR_WATER_CONSUMPTION = "water_consumption"
 ATTR_WATER_LEVEL = "water_level"
 ATTR_WATER_TYPE = "water_type"
 ATTR_WUD = "wud"
 
+FILTERED_SENSORS = [ATTR_TEMPERATURE, ATTR_HUMIDITY, ATTR_REMOTE_SENSOR_RSSI, ATTR_WATER_LEVEL, ATTR_WUD]
+DEFAULT_DEADBAND: dict[str, float] = {ATTR_REMOTE_SENSOR_RSSI: 5}
+DEFAULT_MIN_INTERVAL: dict[str, int] = {ATTR_REMOTE_SENSOR_RSSI: 300}
+FILTER_FALLBACK_INTERVAL = 3600
+
 MODE_MANUAL = "manual"
 
 SERVICE_SEND_COMMAND = "send_command"
+SERVICE_PROFILE = "profile"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_BIND_AP = "bind_ap"
+ATTR_ADDRESSES = "addresses"
 ATTR_COMMAND_ID = "command_id"
 ATTR_COMMAND_DATA = "command_data"
+ATTR_DURATION = "duration"
+ATTR_POINTS = "points"
+DEFAULT_HISTORY_DURATION = 3600
+DEFAULT_HISTORY_POINTS = 60
+MAX_PARALLEL_BINDS = 3
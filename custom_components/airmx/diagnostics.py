@@ -1,16 +1,67 @@
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TYPE
 from homeassistant.core import HomeAssistant
 
+from .aggregates import FleetAggregator
 from .airwater.device import AirWaterDevice
-from .const import CONF_SIGN_KEY, DEVICES, DOMAIN
+from .analytics import FleetAnalytics
+from .const import (
+    AGGREGATES,
+    CONF_SIGN_KEY,
+    DEVICES,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    ENTRY_TYPE_HUB,
+    FLEET,
+    HUBS,
+    SETUP_TIMES,
+)
+from .hub import AirWaterHub
 
 TO_REDACT = {CONF_SIGN_KEY}
 
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, dict[str, Any]]:
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_FLEET:
+        analytics: FleetAnalytics = hass.data[DOMAIN][FLEET]
+        aggregator: FleetAggregator = hass.data[DOMAIN][AGGREGATES]
+        return {
+            "entry": entry.as_dict(),
+            "stats": asdict(analytics.stats),
+            "aggregates": {group: asdict(aggregate) for group, aggregate in aggregator.groups.items()},
+        }
+
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_HUB:
+        hub: AirWaterHub = hass.data[DOMAIN][HUBS][entry.entry_id]
+        return {
+            "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+            "mqtt": hub.mqttc.stats.as_dict(),
+            "devices": {
+                str(device.id): {
+                    "model": device.model,
+                    "stats": device.stats.as_dict(),
+                    "last_report_age": device.last_report_age,
+                    "last_state_report": device.last_state_report,
+                    "capture": device.capture,
+                }
+                for device in hub.devices.values()
+            },
+        }
+
     device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
-    data = {"entry": async_redact_data(entry.as_dict(), TO_REDACT), "last_state_report": device.last_state_report}
+    data = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "setup_times": hass.data[DOMAIN][SETUP_TIMES].get(entry.entry_id, {}),
+        "last_state_report": device.last_state_report,
+        "capture": device.capture,
+        "stats": {
+            "device": device.stats.as_dict(),
+            "mqtt": device.mqtt_stats.as_dict(),
+            "last_report_age": device.last_report_age,
+        },
+    }
     return data
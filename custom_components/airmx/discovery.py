@@ -0,0 +1,247 @@
+import asyncio
+from dataclasses import dataclass, field, replace
+import logging
+import time
+from typing import TYPE_CHECKING, Self
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.const import CONF_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import discovery_flow
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.typing import ConfigType
+
+from .airwater.const import TYPE_CODE_MODELS, AirWaterModel
+from .const import CONF_MQTT_HOST, CONF_MQTT_PORT, DATA_DISCOVERY, DEVICES, DOMAIN, SIGNAL_DEVICE_REMOVED
+from .mqtt.client import MQTTClient
+from .tracing import Trace
+
+if TYPE_CHECKING:
+    from bleak import BLEDevice
+    import paho.mqtt.client as mqtt
+
+    from .airwater.device import AirWaterDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+ADDON_HOSTNAME = "a06532c7-airmx-addon"
+ADDON_TIMEOUT = 10
+DISCOVERY_CACHE_TTL = 30
+REPORT_TOPIC_FILTER = "airwater/01/0/1/1/+"
+
+
+@dataclass
+class AirWaterBLEDevice:
+    model: AirWaterModel
+    device: "BLEDevice"
+
+    @property
+    def name(self) -> str:
+        return self.device.name or ""
+
+    @property
+    def address(self) -> str:
+        return self.device.address
+
+
+@dataclass
+class AirWaterDeviceInfo:
+    id: int
+    ble_mac: str
+    sign_key: str
+    model: AirWaterModel | None = None
+
+    @classmethod
+    def from_dict(cls, data: ConfigType) -> Self:
+        return cls(
+            id=data["id"],
+            sign_key=data["key"],
+            ble_mac=format_mac(data["ble_mac"]).upper(),
+            model=TYPE_CODE_MODELS.get(data.get("type", 0)),
+        )
+
+    @property
+    def name(self) -> str:
+        if self.model:
+            return f"{self.ble_mac} ({self.model.human_readable})"
+
+        return self.ble_mac
+
+
+@dataclass
+class AirWaterDiscoveryResult:
+    wifi_devices: dict[int, AirWaterDeviceInfo] = field(default_factory=dict)
+    ble_devices: dict[str, AirWaterBLEDevice] = field(default_factory=dict)
+    addon_error: Exception | None = None
+
+    def copy(self) -> Self:
+        """Return a copy that a config flow may modify without touching the cached result."""
+        return type(self)(
+            wifi_devices={device_id: replace(device) for device_id, device in self.wifi_devices.items()},
+            ble_devices=dict(self.ble_devices),
+            addon_error=self.addon_error,
+        )
+
+
+@callback
+def async_discover_ble_devices(hass: HomeAssistant) -> dict[str, AirWaterBLEDevice]:
+    """Walk the Bluetooth scanner cache, no scanning is started."""
+    from homeassistant.components import bluetooth
+
+    devices: dict[str, AirWaterBLEDevice] = {}
+    for ble_device in bluetooth.async_get_scanner(hass).discovered_devices:
+        if ble_device.name is not None:
+            try:
+                device = AirWaterBLEDevice(model=AirWaterModel(ble_device.name), device=ble_device)
+                devices[device.address] = device
+            except ValueError:
+                pass
+
+    return devices
+
+
+class AirWaterDiscovery:
+    """Discover devices registered in the addon and advertising over BLE.
+
+    The result is cached for a short time and a discovery in progress is shared by all config flows.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._result: AirWaterDiscoveryResult | None = None
+        self._updated_at = 0.0
+        self._task: asyncio.Task[AirWaterDiscoveryResult] | None = None
+
+    @classmethod
+    @callback
+    def async_get(cls, hass: HomeAssistant) -> Self:
+        discovery: Self = hass.data.setdefault(DATA_DISCOVERY, cls(hass))
+        return discovery
+
+    @property
+    def cached_result(self) -> AirWaterDiscoveryResult | None:
+        """Return the last result regardless of its age, nothing is requested."""
+        return self._result.copy() if self._result else None
+
+    async def async_discover(self) -> AirWaterDiscoveryResult:
+        if self._result and time.monotonic() - self._updated_at < DISCOVERY_CACHE_TTL:
+            return self._result.copy()
+
+        if self._task is None:
+            self._task = self._hass.async_create_task(self._async_discover(), "airmx_discovery")
+            self._task.add_done_callback(self._async_discovery_done)
+
+        return (await asyncio.shield(self._task)).copy()
+
+    @callback
+    def _async_discovery_done(self, task: asyncio.Task[AirWaterDiscoveryResult]) -> None:
+        self._task = None
+        # a result without the addon devices is not cached, the next discovery asks the addon again
+        if not task.cancelled() and task.exception() is None and task.result().addon_error is None:
+            self._result = task.result()
+            self._updated_at = time.monotonic()
+
+    async def _async_discover(self) -> AirWaterDiscoveryResult:
+        addon_task = self._hass.async_create_task(self._async_discover_addon_devices(), eager_start=True)
+
+        result = AirWaterDiscoveryResult()
+        try:
+            result.ble_devices = async_discover_ble_devices(self._hass)
+        except Exception as e:  # bluetooth may be unavailable on the host
+            _LOGGER.debug("BLE discovery failed: %r", e)
+
+        try:
+            result.wifi_devices = await addon_task
+        except Exception as e:
+            _LOGGER.warning("Failed to get device list from AIRMX addon: %r", e)
+            result.addon_error = e
+            return result
+
+        for device in result.wifi_devices.values():
+            if device.model is None and (ble_device := result.ble_devices.get(device.ble_mac)):
+                device.model = ble_device.model
+
+        return result
+
+    async def _async_discover_addon_devices(self) -> dict[int, AirWaterDeviceInfo]:
+        http = async_get_clientsession(self._hass)
+        async with asyncio.timeout(ADDON_TIMEOUT):
+            response = await http.get(f"http://{ADDON_HOSTNAME}/_devices")
+            response.raise_for_status()
+            data = await response.json()
+
+        devices = {}
+        for item in data:
+            device = AirWaterDeviceInfo.from_dict(item)
+            devices[device.id] = device
+
+        return devices
+
+
+class AirWaterMQTTDiscovery:
+    """Start config flows for devices that send reports to the broker but are not configured.
+
+    Reports of known devices are dropped in the paho thread by a set lookup, so only the first report of
+    an unknown device reaches the event loop. A device is known once it is found configured or a flow is
+    started for it, and is forgotten when it is removed, so a deleted device is discovered again.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int):
+        self._hass = hass
+        # replaced rather than modified, it is read by the paho thread
+        self._known_ids: frozenset[int] = frozenset()
+        self._unsub_removed: CALLBACK_TYPE | None = None
+        self._mqttc = MQTTClient(hass, host, port)
+        self._mqttc.subscribe_topics = [REPORT_TOPIC_FILTER]
+        self._mqttc.message_filter = self._filter_mqtt_message
+        self._mqttc.on_message = self._async_handle_mqtt_message
+
+        self.entry_ids: set[str] = set()
+
+    async def async_start(self) -> None:
+        self._unsub_removed = async_dispatcher_connect(self._hass, SIGNAL_DEVICE_REMOVED, self._async_forget_device)
+        await self._mqttc.async_connect()
+
+    async def async_stop(self) -> None:
+        if self._unsub_removed:
+            self._unsub_removed()
+            self._unsub_removed = None
+
+        await self._mqttc.async_disconnect()
+
+    @staticmethod
+    def _get_device_id(message: "mqtt.MQTTMessage") -> int | None:
+        try:
+            return int(message.topic.rsplit("/", 1)[1])
+        except ValueError:
+            return None
+
+    def _filter_mqtt_message(self, message: "mqtt.MQTTMessage") -> bool:
+        device_id = self._get_device_id(message)
+        return device_id is not None and device_id not in self._known_ids
+
+    @callback
+    def _async_forget_device(self, device: "AirWaterDevice") -> None:
+        self._known_ids = self._known_ids - {device.id}
+
+    async def _async_handle_mqtt_message(self, message: "mqtt.MQTTMessage", _: Trace | None = None) -> None:
+        device_id = self._get_device_id(message)
+        if device_id is None or device_id in self._known_ids:
+            return
+
+        self._known_ids = self._known_ids | {device_id}
+        if any(entry.data.get(CONF_ID) == device_id for entry in self._hass.config_entries.async_entries(DOMAIN)):
+            return
+
+        if any(device.id == device_id for device in self._hass.data[DOMAIN][DEVICES].values()):  # owned by a hub
+            return
+
+        _LOGGER.debug("Discovered device %d on %s:%d", device_id, self._mqttc.host, self._mqttc.port)
+        discovery_flow.async_create_flow(
+            self._hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={CONF_ID: device_id, CONF_MQTT_HOST: self._mqttc.host, CONF_MQTT_PORT: self._mqttc.port},
+        )
@@ -1,9 +1,50 @@
+from typing import TYPE_CHECKING, Callable, Sequence
+
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TYPE
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .airwater.device import AirWaterDevice
-from .const import DOMAIN
+from .const import DEVICES, DOMAIN, ENTRY_TYPE_HUB, HUBS, SIGNAL_DEVICE_ADDED
+
+if TYPE_CHECKING:
+    from .hub import AirWaterHub
+
+
+@callback
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    entities_fn: Callable[[AirWaterDevice, ConfigEntry], Sequence[Entity]],
+) -> None:
+    """Add the entities of the entry device, or of all hub devices including those added later."""
+    if entry.data.get(CONF_TYPE) != ENTRY_TYPE_HUB:
+        async_add_entities(entities_fn(hass.data[DOMAIN][DEVICES][entry.entry_id], entry))
+        return
+
+    hub: "AirWaterHub" = hass.data[DOMAIN][HUBS][entry.entry_id]
+    async_add_entities([entity for device in hub.devices.values() for entity in entities_fn(device, entry)])
+
+    @callback
+    def async_add_device_entities(device: AirWaterDevice) -> None:
+        if hub.devices.get(device.id) is device:
+            async_add_entities(entities_fn(device, entry))
+
+    entry.async_on_unload(async_dispatcher_connect(hass, SIGNAL_DEVICE_ADDED, async_add_device_entities))
+
+
+def get_device_info(device: AirWaterDevice) -> DeviceInfo:
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"airwater_{device.id}")},
+        name=device.name,
+        manufacturer="AIRMX",
+        model=device.model.human_readable,
+    )
 
 
 class AirWaterEntity(Entity):
@@ -24,12 +65,11 @@ class AirWaterEntity(Entity):
 
     @property
     def device_info(self) -> DeviceInfo | None:
-        return DeviceInfo(
-            identifiers={(DOMAIN, f"airwater_{self._device.id}")},
-            name=self._device.name,
-            manufacturer="AIRMX",
-            model=self._device.model.human_readable,
-        )
+        return get_device_info(self._device)
 
     async def async_added_to_hass(self) -> None:
-        self.async_on_remove(self._device.async_add_listener(self.async_write_ha_state))
+        self.async_on_remove(self._device.async_add_listener(self._handle_device_update))
+
+    @callback
+    def _handle_device_update(self) -> None:
+        self.async_write_ha_state()
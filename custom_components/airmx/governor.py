@@ -0,0 +1,123 @@
+import asyncio
+from enum import IntEnum
+import logging
+from typing import Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 1.0
+SMOOTHING = 0.3
+RECOVERY_SAMPLES = 30
+
+
+class GovernorLevel(IntEnum):
+    NORMAL = 0
+    ELEVATED = 1
+    HIGH = 2
+    CRITICAL = 3
+
+    @property
+    def lag_threshold(self) -> float:
+        """Smoothed event loop lag (in seconds) at which the level is entered."""
+        return {
+            GovernorLevel.NORMAL: 0.0,
+            GovernorLevel.ELEVATED: 0.05,
+            GovernorLevel.HIGH: 0.2,
+            GovernorLevel.CRITICAL: 1.0,
+        }[self]
+
+    @property
+    def poll_multiplier(self) -> int:
+        return {
+            GovernorLevel.NORMAL: 1,
+            GovernorLevel.ELEVATED: 2,
+            GovernorLevel.HIGH: 4,
+            GovernorLevel.CRITICAL: 6,
+        }[self]
+
+    @property
+    def notify_interval(self) -> float:
+        """Minimal interval (in seconds) between listener notifications caused by device reports."""
+        return {
+            GovernorLevel.NORMAL: 0.0,
+            GovernorLevel.ELEVATED: 2.0,
+            GovernorLevel.HIGH: 5.0,
+            GovernorLevel.CRITICAL: 15.0,
+        }[self]
+
+
+class LoadGovernor:
+    """Sample event loop lag and derive how much background work the devices should shed.
+
+    The level rises as soon as the smoothed lag crosses a threshold and drops one step only after
+    the lag has stayed below the threshold for RECOVERY_SAMPLES consecutive samples.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._handle: asyncio.TimerHandle | None = None
+        self._expected_at = 0.0
+        self._calm_samples = 0
+        self._listeners: list[Callable[[], None]] = []
+
+        self.level = GovernorLevel.NORMAL
+        self.lag = 0.0
+
+    @property
+    def poll_multiplier(self) -> int:
+        return self.level.poll_multiplier
+
+    @property
+    def notify_interval(self) -> float:
+        return self.level.notify_interval
+
+    @callback
+    def async_start(self) -> None:
+        self._schedule()
+
+    @callback
+    def async_stop(self, *_: object) -> None:
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def async_add_listener(self, cb: Callable[[], None]) -> Callable[[], None]:
+        """Add a listener to notify when the level is changed."""
+
+        def unsub() -> None:
+            self._listeners.remove(cb)
+
+        self._listeners.append(cb)
+        return unsub
+
+    def _schedule(self) -> None:
+        self._expected_at = self._hass.loop.time() + SAMPLE_INTERVAL
+        self._handle = self._hass.loop.call_at(self._expected_at, self._sample)
+
+    @callback
+    def _sample(self) -> None:
+        lag = max(0.0, self._hass.loop.time() - self._expected_at)
+        self.lag = self.lag + SMOOTHING * (lag - self.lag)
+        self._schedule()
+
+        level = max(level for level in GovernorLevel if self.lag >= level.lag_threshold)
+        if level > self.level:
+            self._calm_samples = 0
+            self._set_level(level)
+        elif level < self.level:
+            self._calm_samples += 1
+            if self._calm_samples >= RECOVERY_SAMPLES:
+                self._calm_samples = 0
+                self._set_level(GovernorLevel(self.level - 1))
+        else:
+            self._calm_samples = 0
+
+    def _set_level(self, level: GovernorLevel) -> None:
+        _LOGGER.info("Event loop lag is %.0f ms, load level changed to %s", self.lag * 1000, level.name.lower())
+        self.level = level
+
+        for listener in self._listeners:
+            listener()
@@ -0,0 +1,91 @@
+from array import array
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .airwater.device import AirWaterDeviceStatus
+
+HISTORY_SIZE = 720
+HISTORY_RESOLUTION = 5  # seconds
+HISTORY_SPAN = HISTORY_SIZE * HISTORY_RESOLUTION  # the longest period a query can cover
+
+FIELDS = ("humidity", "temperature", "water_level", "fan_speed", "power")
+
+
+class TelemetryHistory:
+    """Fixed-size ring of recent status samples stored in typed arrays.
+
+    Missing values are stored as NaN. At most one sample is kept per HISTORY_RESOLUTION seconds,
+    so the default size covers the last hour in about 20 KiB per device.
+    """
+
+    def __init__(self, size: int = HISTORY_SIZE, resolution: float = HISTORY_RESOLUTION):
+        self._size = size
+        self._resolution = resolution
+        self._index = 0
+        self._count = 0
+        self._time = array("d", bytes(8 * size))
+        self._values = {field: array("f", [math.nan]) * size for field in FIELDS}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, status: "AirWaterDeviceStatus", now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        if self._count and now - self._time[self._index - 1] < self._resolution:
+            return
+
+        self._time[self._index] = now
+        values = {
+            "humidity": status.humidity,
+            "temperature": status.temperature,
+            "water_level": status.water_level,
+            "fan_speed": status.fan_speed,
+            "power": status.power,
+        }
+        for field, value in values.items():
+            self._values[field][self._index] = math.nan if value is None else float(value)
+
+        self._index = (self._index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def columns(self) -> tuple[array, dict[str, array]]:
+        """Return copies of the time and value columns in chronological order, unused slots hold NaN values."""
+        index = self._index
+        return (
+            self._time[index:] + self._time[:index],
+            {field: values[index:] + values[:index] for field, values in self._values.items()},
+        )
+
+    def query(self, start: float, end: float, points: int) -> list[dict[str, Any]]:
+        """Return samples in [start, end) averaged over equal windows, empty windows are omitted."""
+        width = (end - start) / points
+        sums = [dict.fromkeys(FIELDS, 0.0) for _ in range(points)]
+        counts = [dict.fromkeys(FIELDS, 0) for _ in range(points)]
+
+        for offset in range(self._count):
+            position = (self._index - self._count + offset) % self._size
+            sample_time = self._time[position]
+            if not start <= sample_time < end:
+                continue
+
+            window = int((sample_time - start) / width)
+            for field in FIELDS:
+                if not math.isnan(value := self._values[field][position]):
+                    sums[window][field] += value
+                    counts[window][field] += 1
+
+        rv = []
+        for window in range(points):
+            if not any(counts[window].values()):
+                continue
+
+            sample: dict[str, Any] = {"time": start + window * width}
+            for field in FIELDS:
+                count = counts[window][field]
+                sample[field] = round(sums[window][field] / count, 2) if count else None
+
+            rv.append(sample)
+
+        return rv
@@ -0,0 +1,216 @@
+import asyncio
+from datetime import timedelta
+import logging
+from typing import TYPE_CHECKING, Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICES, CONF_ID, CONF_MODEL
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import JSONEncoder
+
+from .airwater.const import AirWaterModel
+from .airwater.device import STORAGE_VERSION, AirWaterDevice, AirWaterSettingsStore
+from .airwater.usage import AirWaterUsageStore
+from .const import (
+    CONF_MQTT_HOST,
+    CONF_MQTT_PORT,
+    CONF_SIGN_KEY,
+    DEVICES,
+    DOMAIN,
+    GOVERNOR,
+    SIGNAL_DEVICE_ADDED,
+    SIGNAL_DEVICE_REMOVED,
+    TRACER,
+)
+from .discovery import REPORT_TOPIC_FILTER, AirWaterDiscovery, AirWaterDiscoveryResult
+from .mqtt.client import MQTTClient
+from .tracing import Trace
+
+if TYPE_CHECKING:
+    import paho.mqtt.client as mqtt
+
+_LOGGER = logging.getLogger(__name__)
+
+HUB_DISCOVERY_INTERVAL = timedelta(minutes=5)
+
+
+class AirWaterHub:
+    """Own all devices registered in the addon on a single connection to the addon MQTT broker.
+
+    Devices are added and removed as the addon device list changes, reports are routed to them by the topic.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        configure_device: Callable[[AirWaterDevice], None],
+    ):
+        self._hass = hass
+        self._entry = entry
+        self._configure_device = configure_device
+        self._unsub_discovery: CALLBACK_TYPE | None = None
+        self._discovery_lock = asyncio.Lock()
+        self._unknown_model_ids: set[int] = set()
+
+        self.mqttc = MQTTClient(hass, entry.data[CONF_MQTT_HOST], entry.data[CONF_MQTT_PORT])
+        self.mqttc.subscribe_topics = [REPORT_TOPIC_FILTER]
+        self.mqttc.on_message = self._async_handle_mqtt_message
+        self.mqttc.on_connect = self._async_handle_mqtt_connect
+        self.mqttc.on_disconnect = self._async_handle_mqtt_disconnect
+        self.mqttc.tracer = hass.data[DOMAIN][TRACER]
+
+        self.devices: dict[int, AirWaterDevice] = {}
+
+    async def async_setup(self) -> None:
+        """Restore the devices known from the previous run, no network is used."""
+        configured_ids = self._configured_ids()
+        for data in self._entry.data.get(CONF_DEVICES, []):
+            if data[CONF_ID] not in configured_ids:  # added with its own entry while the hub was not loaded
+                await self._async_add_device(data[CONF_ID], AirWaterModel(data[CONF_MODEL]), data[CONF_SIGN_KEY])
+
+    async def async_start(self) -> None:
+        await self.mqttc.async_connect()
+        for device in self.devices.values():
+            await device.async_start()
+
+        self._unsub_discovery = async_track_time_interval(self._hass, self.async_discover, HUB_DISCOVERY_INTERVAL)
+        await self.async_discover()
+
+    async def async_stop(self, _: Event | None = None) -> None:
+        if self._unsub_discovery:
+            self._unsub_discovery()
+            self._unsub_discovery = None
+
+        for device_id in list(self.devices):
+            await self._async_remove_device(device_id)
+
+        await self.mqttc.async_disconnect()
+
+    async def async_discover(self, *_: object) -> None:
+        result = await AirWaterDiscovery.async_get(self._hass).async_discover()
+        if result.addon_error:  # keep the devices known so far, the error is logged by the discovery
+            return
+
+        async with self._discovery_lock:
+            await self._async_sync_devices(result)
+
+    async def async_release_device(self, device_id: int) -> None:
+        """Give up a device that is set up with its own entry, the stores are kept for that entry."""
+        async with self._discovery_lock:
+            if device_id not in self.devices:
+                return
+
+            await self._async_remove_device(device_id)
+            self._async_remove_registry_device(device_id)
+            self._async_save_devices()
+
+    async def _async_sync_devices(self, result: AirWaterDiscoveryResult) -> None:
+        configured_ids = self._configured_ids()
+        found: dict[int, tuple[AirWaterModel, str]] = {}
+        for device_id, device in result.wifi_devices.items():
+            if device_id in configured_ids:
+                continue
+
+            # the BLE fallback only works while the device advertises, a known device keeps its model
+            model = device.model or (self.devices[device_id].model if device_id in self.devices else None)
+            if model is None:
+                if device_id not in self._unknown_model_ids:
+                    self._unknown_model_ids.add(device_id)
+                    _LOGGER.warning(
+                        "Model of device %d is unknown, add it with the config flow to select one", device_id
+                    )
+                continue
+
+            found[device_id] = (model, device.sign_key)
+
+        removed_ids = self.devices.keys() - found.keys()
+        for device_id in removed_ids:
+            device = await self._async_remove_device(device_id)
+            self._async_remove_registry_device(device_id)
+            if device_id not in result.wifi_devices:  # a device now configured by its own entry keeps the stores
+                await device.async_remove_stores()
+
+        added = found.keys() - self.devices.keys()
+        for device_id in added:
+            device = await self._async_add_device(device_id, *found[device_id])
+            await device.async_start()
+
+        if removed_ids or added:
+            _LOGGER.debug("Hub devices changed: +%d -%d", len(added), len(removed_ids))
+            self._async_save_devices()
+
+    def _configured_ids(self) -> set[int]:
+        return {
+            entry.data[CONF_ID] for entry in self._hass.config_entries.async_entries(DOMAIN) if CONF_ID in entry.data
+        }
+
+    def _async_save_devices(self) -> None:
+        self._hass.config_entries.async_update_entry(
+            self._entry,
+            data={
+                **self._entry.data,
+                CONF_DEVICES: [
+                    {CONF_ID: device.id, CONF_MODEL: device.model, CONF_SIGN_KEY: device.connection_params[2]}
+                    for device in self.devices.values()
+                ],
+            },
+        )
+
+    async def _async_add_device(self, device_id: int, model: AirWaterModel, sign_key: str) -> AirWaterDevice:
+        device = AirWaterDevice(
+            self._hass,
+            device_id,
+            model,
+            AirWaterSettingsStore(self._hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{device_id}", encoder=JSONEncoder),
+            sign_key,
+            self.mqttc.host,
+            self.mqttc.port,
+            self._hass.data[DOMAIN][GOVERNOR],
+            self._hass.data[DOMAIN][TRACER],
+            AirWaterUsageStore(self._hass, STORAGE_VERSION, f"{DOMAIN}.airwater_{device_id}_usage"),
+            mqtt_client=self.mqttc,
+        )
+        await device.async_setup()
+        self._configure_device(device)
+
+        self.devices[device_id] = device
+        self._hass.data[DOMAIN][DEVICES][self.device_key(device_id)] = device
+        async_dispatcher_send(self._hass, SIGNAL_DEVICE_ADDED, device)
+        return device
+
+    async def _async_remove_device(self, device_id: int) -> AirWaterDevice:
+        device = self.devices.pop(device_id)
+        self._hass.data[DOMAIN][DEVICES].pop(self.device_key(device_id), None)
+        await device.async_stop()
+        async_dispatcher_send(self._hass, SIGNAL_DEVICE_REMOVED, device)
+        return device
+
+    def _async_remove_registry_device(self, device_id: int) -> None:
+        """Remove the device and its entities from the hub entry."""
+        device_registry = dr.async_get(self._hass)
+        if device_entry := device_registry.async_get_device({(DOMAIN, f"airwater_{device_id}")}):
+            device_registry.async_update_device(device_entry.id, remove_config_entry_id=self._entry.entry_id)
+
+    def device_key(self, device_id: int) -> str:
+        return f"{self._entry.entry_id}_{device_id}"
+
+    async def _async_handle_mqtt_message(self, message: "mqtt.MQTTMessage", trace: Trace | None = None) -> None:
+        try:
+            device_id = int(message.topic.rsplit("/", 1)[1])
+        except ValueError:
+            return
+
+        if device := self.devices.get(device_id):
+            await device.async_handle_mqtt_message(message, trace)
+
+    async def _async_handle_mqtt_connect(self) -> None:
+        for device in list(self.devices.values()):
+            await device.async_handle_mqtt_connect()
+
+    async def _async_handle_mqtt_disconnect(self) -> None:
+        for device in list(self.devices.values()):
+            await device.async_handle_mqtt_disconnect()
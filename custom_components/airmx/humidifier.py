@@ -16,9 +16,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 import voluptuous as vol
 
 from .airwater.const import AirWaterCommand, AirWaterMode
-from .airwater.device import AirWaterDevice
-from .const import ATTR_COMMAND_DATA, ATTR_COMMAND_ID, DEVICES, DOMAIN, MODE_MANUAL, SERVICE_SEND_COMMAND
-from .entity import AirWaterEntity
+from .const import ATTR_COMMAND_DATA, ATTR_COMMAND_ID, DOMAIN, MODE_MANUAL, SERVICE_SEND_COMMAND
+from .entity import AirWaterEntity, async_setup_device_entities
 
 
 async def async_setup_entry(
@@ -26,8 +25,9 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
-    async_add_entities([AirWaterHumidifier(device, entry)])
+    async_setup_device_entities(
+        hass, entry, async_add_entities, lambda device, device_entry: [AirWaterHumidifier(device, device_entry)]
+    )
 
     platform = entity_platform.async_get_current_platform()
     platform.async_register_entity_service(
@@ -54,12 +54,7 @@ class AirWaterHumidifier(AirWaterEntity, HumidifierEntity):
 
     @property
     def current_humidity(self) -> int | None:
-        if self._device.status.remote_sensor_online:
-            value = self._device.status.remote_sensor_humidity
-        else:
-            value = self._device.status.internal_sensor_humidity
-
-        if value:
+        if value := self._device.status.humidity:
             return int(value)
 
         return None
@@ -1,10 +1,16 @@
 import asyncio
 import logging
-from typing import Any, Callable, Coroutine
+import time
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
-import paho.mqtt.client as mqtt
+
+from ..stats import MQTTClientStats
+from ..tracing import Trace, Tracer
+
+if TYPE_CHECKING:
+    import paho.mqtt.client as mqtt
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,86 +25,137 @@ class MQTTClient:
         password: str | None = None,
     ):
         self._hass = hass
-        self._client = mqtt.Client()
-        self._client.on_connect = self._mqtt_on_connect
-        self._client.on_message = self._mqtt_on_message
-        self._client.on_disconnect = self._mqtt_on_disconnect
+        self._client: "mqtt.Client | None" = None
         self._host = host
         self._port = port
+        self._username = username
+        self._password = password
         self._lock = asyncio.Lock()
 
+        self.stats = MQTTClientStats()
+        self.tracer: Tracer | None = None
+        self.trace_sample_rate = 0.0
         self.subscribe_topics: list[str] = []
-        self.on_message: Callable[[mqtt.MQTTMessage], Coroutine[Any, Any, None]] | None = None
+        self.on_message: "Callable[[mqtt.MQTTMessage, Trace | None], Coroutine[Any, Any, None]] | None" = None
+        # called in the paho thread, messages it rejects never reach the event loop
+        self.message_filter: "Callable[[mqtt.MQTTMessage], bool] | None" = None
         self.on_connect: Callable[[], Coroutine[Any, Any, None]] | None = None
         self.on_disconnect: Callable[[], Coroutine[Any, Any, None]] | None = None
 
-        if username and password:
-            self._client.username_pw_set(username, password)
-
     async def async_connect(self) -> None:
+        # paho is imported on first connect to keep it off the integration import path
+        client = self._client = await self._hass.async_add_import_executor_job(self._create_client)
         result: int | None = None
 
         try:
-            result = await self._hass.async_add_executor_job(self._client.connect, self._host, self._port)
+            result = await self._hass.async_add_executor_job(client.connect, self._host, self._port)
         except OSError as err:
             _LOGGER.error(f"Failed to connect to MQTT server due to exception: {err}")
 
         if result is not None and result != 0:
-            _LOGGER.error("Failed to connect to MQTT server: %s", mqtt.error_string(result))
+            _LOGGER.error("Failed to connect to MQTT server: %s", self._error_string(result))
 
-        self._client.loop_start()
+        client.loop_start()
 
     async def async_disconnect(self) -> None:
+        if (client := self._client) is None:
+            return
+
         async with self._lock:
-            await self._hass.async_add_executor_job(lambda: self._client.disconnect())
+            await self._hass.async_add_executor_job(client.disconnect)
 
     async def async_publish(self, topic: str, payload: bytes) -> None:
+        if (client := self._client) is None:
+            raise HomeAssistantError("Error talking to MQTT: The client is not currently connected.")
+
         async with self._lock:
-            msg_info = await self._hass.async_add_executor_job(self._client.publish, topic, payload)
+            started_at = time.perf_counter()
+            msg_info = await self._hass.async_add_executor_job(client.publish, topic, payload)
+            self.stats.publish_latency.add(time.perf_counter() - started_at)
+            self.stats.messages_published += 1
 
-        _LOGGER.debug(f"Transmitting message on {topic}: {payload!r}")
+        _LOGGER.debug("Transmitting message on %s: %r", topic, payload)
         self._raise_on_error(msg_info.rc)
 
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @property
+    def port(self) -> int:
+        return self._port
+
     @property
     def connected(self) -> bool:
-        return self._client.is_connected()
+        return self._client is not None and self._client.is_connected()
+
+    def _create_client(self) -> "mqtt.Client":
+        import paho.mqtt.client as mqtt
+
+        client = mqtt.Client()
+        client.on_connect = self._mqtt_on_connect
+        client.on_message = self._mqtt_on_message
+        client.on_disconnect = self._mqtt_on_disconnect
+
+        if self._username and self._password:
+            client.username_pw_set(self._username, self._password)
+
+        return client
 
     def _mqtt_on_connect(
         self,
-        _mqttc: mqtt.Client,
+        _mqttc: "mqtt.Client",
         _userdata: None,
         _flags: dict[str, int],
         result_code: int,
-        _properties: mqtt.Properties | None = None,
+        _properties: "mqtt.Properties | None" = None,
     ) -> None:
         _LOGGER.info(f"Connected to MQTT server ({result_code})")
+        if result_code == 0:
+            self.stats.connects += 1
 
         for topic in self.subscribe_topics:
             _LOGGER.info(f"Subscribe to {topic}")
-            self._client.subscribe(topic)
+            _mqttc.subscribe(topic)
 
         if self.on_connect is not None:
             self._hass.add_job(self.on_connect())
 
     def _mqtt_on_disconnect(
         self,
-        _mqttc: mqtt.Client,
+        _mqttc: "mqtt.Client",
         _userdata: None,
         result_code: int,
-        _properties: mqtt.Properties | None = None,
+        _properties: "mqtt.Properties | None" = None,
     ) -> None:
         _LOGGER.info(f"Disconnected from MQTT server ({result_code})")
+        self.stats.disconnects += 1
 
         if self.on_disconnect:
             self._hass.add_job(self.on_disconnect())
 
-    def _mqtt_on_message(self, _mqttc: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage) -> None:
-        _LOGGER.debug(f"Received from MQTT: {msg.payload!r}")
+    def _mqtt_on_message(self, _mqttc: "mqtt.Client", _userdata: None, msg: "mqtt.MQTTMessage") -> None:
+        trace = self.tracer.sample(self.trace_sample_rate) if self.tracer else None
+        _LOGGER.debug("Received from MQTT: %r", msg.payload)
+        self.stats.messages_received += 1
+
+        if self.message_filter is not None and not self.message_filter(msg):
+            return
 
         if self.on_message:
-            self._hass.add_job(self.on_message(msg))
+            if trace:
+                trace.handed_off_at = time.time_ns()
+                trace.add_span("mqtt.receive", trace.started_at, trace.handed_off_at, topic=msg.topic)
+
+            self._hass.add_job(self.on_message(msg, trace))
 
     @staticmethod
-    def _raise_on_error(result_code: int) -> None:
-        if result_code and (message := mqtt.error_string(result_code)):
+    def _error_string(result_code: int) -> str:
+        import paho.mqtt.client as mqtt
+
+        return mqtt.error_string(result_code)
+
+    @classmethod
+    def _raise_on_error(cls, result_code: int) -> None:
+        if result_code and (message := cls._error_string(result_code)):
             raise HomeAssistantError(f"Error talking to MQTT: {message}")
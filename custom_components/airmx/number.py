@@ -8,8 +8,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .airwater.const import AirWaterFeature
 from .airwater.device import AirWaterDevice
-from .const import ATTR_FAN_SPEED, DEVICES, DOMAIN
-from .entity import AirWaterEntity
+from .const import ATTR_FAN_SPEED
+from .entity import AirWaterEntity, async_setup_device_entities
 
 
 @dataclass(frozen=True)
@@ -49,14 +49,17 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
+    async_setup_device_entities(hass, entry, async_add_entities, _get_entities)
+
+
+def _get_entities(device: AirWaterDevice, entry: ConfigEntry) -> list[NumberEntity]:
     entities: list[NumberEntity] = []
 
     for description in FAN_SPEED_TYPES:
         if bool(device.model.features & description.feature):
             entities.append(AirWaterGenericFanSpeedEntity(device, entry, description))
 
-    async_add_entities(entities)
+    return entities
 
 
 class AirWaterGenericFanSpeedEntity(AirWaterEntity, NumberEntity):
@@ -6,8 +6,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .airwater.const import WaterType as AirWaterWaterType
 from .airwater.device import AirWaterDevice
-from .const import ATTR_WATER_TYPE, DEVICES, DOMAIN
-from .entity import AirWaterEntity
+from .const import ATTR_WATER_TYPE
+from .entity import AirWaterEntity, async_setup_device_entities
 
 WATER_TYPE_TAP = "tap"
 WATER_TYPE_FILTERED = "filtered"
@@ -18,8 +18,11 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
-    async_add_entities([AirWaterWaterTypeEntity(device, entry)])
+    async_setup_device_entities(hass, entry, async_add_entities, _get_entities)
+
+
+def _get_entities(device: AirWaterDevice, entry: ConfigEntry) -> list[SelectEntity]:
+    return [AirWaterWaterTypeEntity(device, entry)]
 
 
 class AirWaterWaterTypeEntity(AirWaterEntity, SelectEntity):
@@ -1,21 +1,126 @@
-from dataclasses import asdict
-from typing import Any, Mapping, cast
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import time
+from typing import TYPE_CHECKING, Any, Callable, Mapping, cast
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_TEMPERATURE,
+    CONF_TYPE,
     PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     EntityCategory,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .aggregates import FLEET_GROUP, Aggregate, FleetAggregator
+from .airwater.const import AirWaterFeature
 from .airwater.device import AirWaterDevice
-from .const import ATTR_HUMIDITY, ATTR_REMOTE_SENSOR_RSSI, ATTR_STATUS, ATTR_WATER_LEVEL, ATTR_WUD, DEVICES, DOMAIN
-from .entity import AirWaterEntity
+from .analytics import FleetAnalytics, FleetStats
+from .const import (
+    AGGREGATES,
+    ATTR_AREA_AVERAGE_HUMIDITY,
+    ATTR_AREA_NEED_CLEANING,
+    ATTR_AREA_NEED_REFILL,
+    ATTR_DECODE_TIME,
+    ATTR_DEVICES,
+    ATTR_FAN_RUNTIME,
+    ATTR_FLEET_AVERAGE_HUMIDITY,
+    ATTR_FLEET_BELOW_TARGET,
+    ATTR_FLEET_NEED_CLEANING,
+    ATTR_FLEET_NEED_REFILL,
+    ATTR_FLEET_SENSOR_DISAGREEMENT,
+    ATTR_FLEET_WATER_DRAIN,
+    ATTR_GOVERNOR_LEVEL,
+    ATTR_HEATER_RUNTIME,
+    ATTR_HUMIDITY,
+    ATTR_LAST_REPORT_AGE,
+    ATTR_LOOP_LAG,
+    ATTR_MESSAGES_RECEIVED,
+    ATTR_NOTIFY_TIME,
+    ATTR_PUBLISH_LATENCY,
+    ATTR_RECONNECTS,
+    ATTR_REMOTE_SENSOR_RSSI,
+    ATTR_STATUS,
+    ATTR_TIME_TO_EMPTY,
+    ATTR_WATER_CONSUMPTION,
+    ATTR_WATER_LEVEL,
+    ATTR_WUD,
+    CONF_DEADBAND,
+    CONF_MIN_INTERVAL,
+    DEFAULT_DEADBAND,
+    DEFAULT_MIN_INTERVAL,
+    DOMAIN,
+    ENTRY_TYPE_FLEET,
+    ENTRY_TYPE_HUB,
+    FILTER_FALLBACK_INTERVAL,
+    FLEET,
+    GOVERNOR,
+    GOVERNOR_SENSOR_HOSTS,
+    HUBS,
+)
+from .entity import AirWaterEntity, async_setup_device_entities, get_device_info
+from .governor import GovernorLevel, LoadGovernor
+from .stats import Histogram, MQTTClientStats
+
+if TYPE_CHECKING:
+    from .hub import AirWaterHub
+
+
+@dataclass(frozen=True)
+class AirWaterStatsSensorDescriptionMixin:
+    value_fn: Callable[[AirWaterDevice], float | None]
+
+
+@dataclass(frozen=True)
+class AirWaterStatsSensorDescription(SensorEntityDescription, AirWaterStatsSensorDescriptionMixin): ...
+
+
+@dataclass(frozen=True)
+class AirWaterMQTTStatsSensorDescriptionMixin:
+    value_fn: Callable[[MQTTClientStats], float | None]
+
+
+@dataclass(frozen=True)
+class AirWaterMQTTStatsSensorDescription(SensorEntityDescription, AirWaterMQTTStatsSensorDescriptionMixin): ...
+
+
+@dataclass(frozen=True)
+class AirWaterFleetSensorDescriptionMixin:
+    value_fn: Callable[[FleetStats], float | None]
+    devices_fn: Callable[[FleetStats], dict[str, float]]
+
+
+@dataclass(frozen=True)
+class AirWaterFleetSensorDescription(SensorEntityDescription, AirWaterFleetSensorDescriptionMixin): ...
+
+
+@dataclass(frozen=True)
+class AirWaterAggregateSensorDescriptionMixin:
+    value_fn: Callable[[Aggregate], float | None]
+    area_translation_key: str
+
+
+@dataclass(frozen=True)
+class AirWaterAggregateSensorDescription(SensorEntityDescription, AirWaterAggregateSensorDescriptionMixin): ...
+
+
+STATS_WRITE_INTERVAL = 30  # seconds
+SCAN_INTERVAL = timedelta(seconds=STATS_WRITE_INTERVAL)  # MQTT stats sensors are polled
+
+
+def _p99_ms(histogram: Histogram) -> float | None:
+    if (value := histogram.quantile(0.99)) is None:
+        return None
+
+    return round(value * 1000, 2)
+
 
 SENSOR_TYPES = (
     SensorEntityDescription(
@@ -44,13 +149,236 @@ SENSOR_TYPES = (
     ),
 )
 
+STATS_SENSOR_TYPES = (
+    AirWaterStatsSensorDescription(
+        key=ATTR_MESSAGES_RECEIVED,
+        translation_key=ATTR_MESSAGES_RECEIVED,
+        icon="mdi:message-arrow-left-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda device: device.stats.total_messages_received,
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_DECODE_TIME,
+        translation_key=ATTR_DECODE_TIME,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda device: _p99_ms(device.stats.decode_time),
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_NOTIFY_TIME,
+        translation_key=ATTR_NOTIFY_TIME,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda device: _p99_ms(device.stats.notify_time),
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_LAST_REPORT_AGE,
+        translation_key=ATTR_LAST_REPORT_AGE,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda device: None if (age := device.last_report_age) is None else round(age),
+    ),
+)
+
+# the client of a hub is shared by its devices, its counters are added once to the hub
+MQTT_STATS_SENSOR_TYPES = (
+    AirWaterMQTTStatsSensorDescription(
+        key=ATTR_PUBLISH_LATENCY,
+        translation_key=ATTR_PUBLISH_LATENCY,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: _p99_ms(stats.publish_latency),
+    ),
+    AirWaterMQTTStatsSensorDescription(
+        key=ATTR_RECONNECTS,
+        translation_key=ATTR_RECONNECTS,
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda stats: stats.reconnects,
+    ),
+)
+
+
+USAGE_SENSOR_TYPES = (
+    AirWaterStatsSensorDescription(
+        key=ATTR_WATER_CONSUMPTION,
+        translation_key=ATTR_WATER_CONSUMPTION,
+        icon="mdi:water-minus",
+        native_unit_of_measurement=f"{PERCENTAGE}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda device: round(device.usage.water_consumption, 1),
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_TIME_TO_EMPTY,
+        translation_key=ATTR_TIME_TO_EMPTY,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda device: None if (value := device.usage.time_to_empty) is None else round(value / 3600, 1),
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_FAN_RUNTIME,
+        translation_key=ATTR_FAN_RUNTIME,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: round(device.usage.fan_runtime / 3600, 2),
+    ),
+    AirWaterStatsSensorDescription(
+        key=ATTR_HEATER_RUNTIME,
+        translation_key=ATTR_HEATER_RUNTIME,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: round(device.usage.heater_runtime / 3600, 2),
+    ),
+)
+
+FLEET_SENSOR_TYPES = (
+    AirWaterFleetSensorDescription(
+        key=ATTR_FLEET_BELOW_TARGET,
+        translation_key=ATTR_FLEET_BELOW_TARGET,
+        icon="mdi:water-percent-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: len(stats.below_target),
+        devices_fn=lambda stats: stats.below_target,
+    ),
+    AirWaterFleetSensorDescription(
+        key=ATTR_FLEET_WATER_DRAIN,
+        translation_key=ATTR_FLEET_WATER_DRAIN,
+        icon="mdi:cup-water",
+        native_unit_of_measurement=f"{PERCENTAGE}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.max_water_drain,
+        devices_fn=lambda stats: stats.water_drain,
+    ),
+    AirWaterFleetSensorDescription(
+        key=ATTR_FLEET_SENSOR_DISAGREEMENT,
+        translation_key=ATTR_FLEET_SENSOR_DISAGREEMENT,
+        icon="mdi:thermometer-alert",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: len(stats.sensor_disagreement),
+        devices_fn=lambda stats: stats.sensor_disagreement,
+    ),
+)
+
+AGGREGATE_SENSOR_TYPES = (
+    AirWaterAggregateSensorDescription(
+        key=ATTR_FLEET_AVERAGE_HUMIDITY,
+        translation_key=ATTR_FLEET_AVERAGE_HUMIDITY,
+        area_translation_key=ATTR_AREA_AVERAGE_HUMIDITY,
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.average_humidity,
+    ),
+    AirWaterAggregateSensorDescription(
+        key=ATTR_FLEET_NEED_CLEANING,
+        translation_key=ATTR_FLEET_NEED_CLEANING,
+        area_translation_key=ATTR_AREA_NEED_CLEANING,
+        icon="mdi:spray-bottle",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.need_cleaning,
+    ),
+    AirWaterAggregateSensorDescription(
+        key=ATTR_FLEET_NEED_REFILL,
+        translation_key=ATTR_FLEET_NEED_REFILL,
+        area_translation_key=ATTR_AREA_NEED_REFILL,
+        icon="mdi:cup-off-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.need_refill,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
+    _async_add_governor_sensor(hass, entry, async_add_entities)
+
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_FLEET:
+        analytics: FleetAnalytics = hass.data[DOMAIN][FLEET]
+        aggregator: FleetAggregator = hass.data[DOMAIN][AGGREGATES]
+
+        @callback
+        def async_add_group_entities(group: str) -> None:
+            area_name = None
+            if group != FLEET_GROUP and (area := ar.async_get(hass).async_get_area(group)):
+                area_name = area.name
+
+            async_add_entities(
+                [
+                    AirWaterAggregateSensor(aggregator, group, area_name, description)
+                    for description in AGGREGATE_SENSOR_TYPES
+                ]
+            )
+
+        async_add_entities([AirWaterFleetSensor(analytics, description) for description in FLEET_SENSOR_TYPES])
+        for group in aggregator.groups:
+            async_add_group_entities(group)
+
+        entry.async_on_unload(aggregator.async_add_group_listener(async_add_group_entities))
+        return
+
+    if entry.data.get(CONF_TYPE) == ENTRY_TYPE_HUB:
+        hub: "AirWaterHub" = hass.data[DOMAIN][HUBS][entry.entry_id]
+        hub_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{ENTRY_TYPE_HUB}_{entry.entry_id}")},
+            name=entry.title,
+            manufacturer="AIRMX",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        async_add_entities(
+            [
+                AirWaterMQTTStatsSensor(
+                    hub.mqttc.stats, f"{ENTRY_TYPE_HUB}_{entry.entry_id}", hub_device_info, description
+                )
+                for description in MQTT_STATS_SENSOR_TYPES
+            ]
+        )
+
+    async_setup_device_entities(hass, entry, async_add_entities, _get_entities)
+
+
+@callback
+def _async_add_governor_sensor(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Add the load level sensor with the first loaded entry, it is handed over to the next one on unload."""
+    hosts: dict[str, AddEntitiesCallback] = hass.data[DOMAIN][GOVERNOR_SENSOR_HOSTS]
+    if not hosts:
+        async_add_entities([AirWaterGovernorSensor(hass.data[DOMAIN][GOVERNOR])])
+
+    hosts[entry.entry_id] = async_add_entities
+
+    @callback
+    def async_remove_host() -> None:
+        was_host = next(iter(hosts)) == entry.entry_id
+        hosts.pop(entry.entry_id)
+        if was_host and hosts:  # the platform is unloaded already, so the unique_id is free
+            next(iter(hosts.values()))([AirWaterGovernorSensor(hass.data[DOMAIN][GOVERNOR])])
+
+    entry.async_on_unload(async_remove_host)
+
+
+def _get_entities(device: AirWaterDevice, entry: ConfigEntry) -> list[SensorEntity]:
     entities: list[SensorEntity] = [
         AirWaterTemperatureSensor(device, entry),
         AirWaterHumiditySensor(device, entry),
@@ -60,10 +388,82 @@ async def async_setup_entry(
     for description in SENSOR_TYPES:
         entities.append(AirWaterGenericSensor(device, entry, description))
 
-    async_add_entities(entities)
+    for stats_description in STATS_SENSOR_TYPES:
+        entities.append(AirWaterStatsSensor(device, entry, stats_description))
+
+    if device.owns_mqtt_client:
+        for mqtt_stats_description in MQTT_STATS_SENSOR_TYPES:
+            entities.append(
+                AirWaterMQTTStatsSensor(
+                    device.mqtt_stats, f"airwater_{device.id}", get_device_info(device), mqtt_stats_description
+                )
+            )
+
+    for usage_description in USAGE_SENSOR_TYPES:
+        if usage_description.key == ATTR_HEATER_RUNTIME and not device.model.features & AirWaterFeature.HEATER:
+            continue
+
+        entities.append(AirWaterUsageSensor(device, entry, usage_description))
+
+    return entities
+
+
+class AirWaterFilteredSensor(AirWaterEntity, SensorEntity):
+    """Sensor that writes changes beyond the deadband immediately and the rest at most once per min interval.
+
+    The deadband is measured from the last written value, so slow drift is written once it adds up. Without
+    a min interval the changes within the deadband are still written once per FILTER_FALLBACK_INTERVAL.
+    """
+
+    _written_value: float | None = None
+    _written_available: bool | None = None
+    _written_at: float = 0
+
+    @property
+    def deadband(self) -> float:
+        key = self.entity_description.key
+        return float(self._entry.options.get(key, {}).get(CONF_DEADBAND, DEFAULT_DEADBAND.get(key, 0)))
+
+    @property
+    def min_interval(self) -> int:
+        key = self.entity_description.key
+        return int(self._entry.options.get(key, {}).get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL.get(key, 0)))
+
+    @callback
+    def _handle_device_update(self) -> None:
+        if self._should_write_state():
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._written_value = cast(float | None, self.native_value)
+        self._written_available = self.available
+        self._written_at = time.monotonic()
+        super().async_write_ha_state()
 
+    def _should_write_state(self) -> bool:
+        if self.available != self._written_available:
+            return True
 
-class AirWaterGenericSensor(AirWaterEntity, SensorEntity):
+        value = cast(float | None, self.native_value)
+        if value == self._written_value:
+            return False
+
+        if value is None or self._written_value is None:
+            return True
+
+        deadband = self.deadband
+        if deadband and abs(value - self._written_value) >= deadband:
+            return True
+
+        min_interval = self.min_interval
+        if not deadband and not min_interval:
+            return True  # no filtering, every change is written
+
+        return time.monotonic() - self._written_at >= (min_interval or FILTER_FALLBACK_INTERVAL)
+
+
+class AirWaterGenericSensor(AirWaterFilteredSensor):
     def __init__(self, device: AirWaterDevice, entry: ConfigEntry, description: SensorEntityDescription) -> None:
         super().__init__(device, entry)
         self.entity_description = description
@@ -77,7 +477,23 @@ class AirWaterGenericSensor(AirWaterEntity, SensorEntity):
         return cast(int | None, getattr(self._device.status, self.entity_description.key))
 
 
-class AirWaterTemperatureSensor(AirWaterEntity, SensorEntity):
+class AirWaterUsageSensor(AirWaterFilteredSensor):
+    entity_description: AirWaterStatsSensorDescription
+
+    def __init__(self, device: AirWaterDevice, entry: ConfigEntry, description: AirWaterStatsSensorDescription) -> None:
+        super().__init__(device, entry)
+        self.entity_description = description
+
+    @property
+    def unique_id(self) -> str:
+        return f"{super().unique_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self._device)
+
+
+class AirWaterTemperatureSensor(AirWaterFilteredSensor):
     entity_description = SensorEntityDescription(
         key=ATTR_TEMPERATURE,
         translation_key=ATTR_TEMPERATURE,
@@ -92,18 +508,13 @@ class AirWaterTemperatureSensor(AirWaterEntity, SensorEntity):
 
     @property
     def native_value(self) -> float | None:
-        if self._device.status.remote_sensor_online:
-            value = self._device.status.remote_sensor_temperature
-        else:
-            value = self._device.status.internal_sensor_temperature
-
-        if value:
+        if value := self._device.status.temperature:
             return round(value, 1)
 
         return None
 
 
-class AirWaterHumiditySensor(AirWaterEntity, SensorEntity):
+class AirWaterHumiditySensor(AirWaterFilteredSensor):
     entity_description = SensorEntityDescription(
         key=ATTR_HUMIDITY,
         translation_key=ATTR_HUMIDITY,
@@ -118,12 +529,7 @@ class AirWaterHumiditySensor(AirWaterEntity, SensorEntity):
 
     @property
     def native_value(self) -> int | None:
-        if self._device.status.remote_sensor_online:
-            value = self._device.status.remote_sensor_humidity
-        else:
-            value = self._device.status.internal_sensor_humidity
-
-        if value:
+        if value := self._device.status.humidity:
             return int(value)
 
         return None
@@ -154,3 +560,196 @@ class AirWaterStatusSensor(AirWaterEntity, SensorEntity):
                 attrs[f"{prefix}.{key}"] = value
 
         return attrs
+
+
+class AirWaterStatsSensor(AirWaterEntity, SensorEntity):
+    entity_description: AirWaterStatsSensorDescription
+
+    _written_at: float = 0
+
+    def __init__(self, device: AirWaterDevice, entry: ConfigEntry, description: AirWaterStatsSensorDescription) -> None:
+        super().__init__(device, entry)
+        self.entity_description = description
+
+    @property
+    def unique_id(self) -> str:
+        return f"{super().unique_id}_{self.entity_description.key}"
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self._device)
+
+    @callback
+    def _handle_device_update(self) -> None:
+        # counters change with every report, writing them each time would load the path they measure
+        if time.monotonic() - self._written_at >= STATS_WRITE_INTERVAL:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        self._written_at = time.monotonic()
+        super().async_write_ha_state()
+
+
+class AirWaterMQTTStatsSensor(SensorEntity):
+    """Counters of an MQTT client, polled every SCAN_INTERVAL as they change with every message."""
+
+    entity_description: AirWaterMQTTStatsSensorDescription
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        stats: MQTTClientStats,
+        unique_id_prefix: str,
+        device_info: DeviceInfo,
+        description: AirWaterMQTTStatsSensorDescription,
+    ) -> None:
+        self._stats = stats
+        self._unique_id_prefix = unique_id_prefix
+        self._device_info = device_info
+        self.entity_description = description
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._unique_id_prefix}_{self.entity_description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo | None:
+        return self._device_info
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self._stats)
+
+
+class AirWaterFleetSensor(SensorEntity):
+    entity_description: AirWaterFleetSensorDescription
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(self, analytics: FleetAnalytics, description: AirWaterFleetSensorDescription) -> None:
+        self._analytics = analytics
+        self.entity_description = description
+
+    @property
+    def unique_id(self) -> str:
+        return f"{ENTRY_TYPE_FLEET}_{self.entity_description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo | None:
+        return DeviceInfo(
+            identifiers={(DOMAIN, ENTRY_TYPE_FLEET)},
+            name="AIRMX fleet",
+            manufacturer="AIRMX",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self._analytics.stats)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {ATTR_DEVICES: self.entity_description.devices_fn(self._analytics.stats)}
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._analytics.async_add_listener(self.async_write_ha_state))
+
+
+class AirWaterGovernorSensor(SensorEntity):
+    """Load level of the event loop, it is shared by all entries so a single entity is added."""
+
+    entity_description = SensorEntityDescription(
+        key=ATTR_GOVERNOR_LEVEL,
+        translation_key=ATTR_GOVERNOR_LEVEL,
+        icon="mdi:speedometer",
+        device_class=SensorDeviceClass.ENUM,
+        options=[level.name.lower() for level in GovernorLevel],
+        entity_category=EntityCategory.DIAGNOSTIC,
+    )
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(self, governor: LoadGovernor) -> None:
+        self._governor = governor
+
+    @property
+    def unique_id(self) -> str:
+        return self.entity_description.key
+
+    @property
+    def device_info(self) -> DeviceInfo | None:
+        return DeviceInfo(
+            identifiers={(DOMAIN, GOVERNOR)},
+            name="AIRMX",
+            manufacturer="AIRMX",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self) -> str:
+        return self._governor.level.name.lower()
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {ATTR_LOOP_LAG: round(self._governor.lag * 1000)}
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self._governor.async_add_listener(self.async_write_ha_state))
+
+
+class AirWaterAggregateSensor(SensorEntity):
+    entity_description: AirWaterAggregateSensorDescription
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        aggregator: FleetAggregator,
+        group: str,
+        area_name: str | None,
+        description: AirWaterAggregateSensorDescription,
+    ) -> None:
+        self._aggregator = aggregator
+        self._group = group
+        self.entity_description = description
+
+        if group != FLEET_GROUP:
+            self._attr_translation_key = description.area_translation_key
+            self._attr_translation_placeholders = {"area": area_name or group}
+
+    @property
+    def unique_id(self) -> str:
+        if self._group == FLEET_GROUP:
+            return f"{ENTRY_TYPE_FLEET}_{self.entity_description.key}"
+
+        return f"{ENTRY_TYPE_FLEET}_{self._group}_{self.entity_description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo | None:
+        return DeviceInfo(
+            identifiers={(DOMAIN, ENTRY_TYPE_FLEET)},
+            name="AIRMX fleet",
+            manufacturer="AIRMX",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self._aggregator.groups[self._group])
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        return {ATTR_DEVICES: self._aggregator.groups[self._group].devices}
+
+    async def async_added_to_hass(self) -> None:
+        self.async_on_remove(self._aggregator.async_add_listener(self._group, self.async_write_ha_state))
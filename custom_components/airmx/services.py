@@ -0,0 +1,207 @@
+import asyncio
+import cProfile
+from datetime import datetime
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.const import ATTR_DEVICE_ID, CONF_PASSWORD
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+import voluptuous as vol
+
+from .airwater.device import AirWaterDevice
+from .const import (
+    ATTR_ADDRESSES,
+    ATTR_DURATION,
+    ATTR_POINTS,
+    CONF_SSID,
+    DEFAULT_HISTORY_DURATION,
+    DEFAULT_HISTORY_POINTS,
+    DEVICES,
+    DOMAIN,
+    MAX_PARALLEL_BINDS,
+    SERVICE_BIND_AP,
+    SERVICE_GET_HISTORY,
+    SERVICE_PROFILE,
+)
+from .discovery import async_discover_ble_devices
+from .history import HISTORY_SPAN
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_TOP_ENTRIES = 50
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=30): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+    }
+)
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=DEFAULT_HISTORY_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=HISTORY_SPAN)
+        ),
+        vol.Optional(ATTR_POINTS, default=DEFAULT_HISTORY_POINTS): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    }
+)
+BIND_AP_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ADDRESSES, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(CONF_SSID): cv.string,
+        vol.Required(CONF_PASSWORD): cv.string,
+    }
+)
+
+
+def async_register_services(hass: HomeAssistant) -> None:
+    lock = asyncio.Lock()
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        if lock.locked():
+            raise HomeAssistantError("Profiling is already in progress")
+
+        async with lock:
+            return await _async_profile(hass, call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_handle_get_history(call: ServiceCall) -> ServiceResponse:
+        device = _get_device(hass, call.data[ATTR_DEVICE_ID])
+        now = time.time()
+        return {"samples": device.history.query(now - call.data[ATTR_DURATION], now, call.data[ATTR_POINTS])}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_handle_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_handle_bind_ap(call: ServiceCall) -> ServiceResponse:
+        return await _async_bind_ap(hass, call.data[ATTR_ADDRESSES], call.data[CONF_SSID], call.data[CONF_PASSWORD])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BIND_AP,
+        async_handle_bind_ap,
+        schema=BIND_AP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _get_device(hass: HomeAssistant, device_registry_id: str) -> AirWaterDevice:
+    if device_entry := dr.async_get(hass).async_get(device_registry_id):
+        for device in hass.data[DOMAIN][DEVICES].values():
+            if (DOMAIN, f"airwater_{device.id}") in device_entry.identifiers:
+                return device
+
+    raise HomeAssistantError(f"Device {device_registry_id} is not an AIRMX device")
+
+
+async def _async_bind_ap(hass: HomeAssistant, addresses: list[str], ssid: str, password: str) -> ServiceResponse:
+    """Bind the devices to the access point, limiting the number of simultaneous BLE connections.
+
+    Without addresses all AirWater devices currently advertising are bound.
+    """
+    from homeassistant.components import bluetooth
+
+    from .airwater.ble import AirWaterBindAPError, AirWaterBLEConnector
+
+    if addresses:
+        ble_devices = {address.upper(): bluetooth.async_ble_device_from_address(hass, address) for address in addresses}
+    else:
+        ble_devices = {address: device.device for address, device in async_discover_ble_devices(hass).items()}
+
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_BINDS)
+
+    async def async_bind(address: str) -> dict[str, Any]:
+        if (ble_device := ble_devices[address]) is None:
+            return {"address": address, "name": None, "success": False, "error": "Device not found", "duration": 0}
+
+        async with semaphore:
+            started_at = time.monotonic()
+            try:
+                await AirWaterBLEConnector().bind_ap(ble_device, ssid, password)
+                error = None
+            except AirWaterBindAPError as e:
+                error = str(e)
+            except Exception as e:  # one failing device must not discard the results of the others
+                _LOGGER.exception("Failed to bind %s to the access point", address)
+                error = repr(e)
+
+        return {
+            "address": address,
+            "name": ble_device.name,
+            "success": error is None,
+            "error": error,
+            "duration": round(time.monotonic() - started_at, 1),
+        }
+
+    return {"devices": await asyncio.gather(*(async_bind(address) for address in ble_devices))}
+
+
+async def _async_profile(hass: HomeAssistant, duration: float) -> ServiceResponse:
+    """Profile the event loop thread and trace allocations made by the integration for the given duration."""
+    profiler = cProfile.Profile()
+    tracemalloc_started = not tracemalloc.is_tracing()
+    if tracemalloc_started:
+        tracemalloc.start()
+
+    try:
+        profiler.enable()
+    except ValueError as e:  # another profiler is active
+        if tracemalloc_started:
+            tracemalloc.stop()
+        raise HomeAssistantError(f"Unable to start profiler: {e}") from e
+
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if tracemalloc_started:
+            tracemalloc.stop()
+
+    suffix = datetime.now().strftime("%Y%m%d_%H%M%S")
+    profile_path = hass.config.path(f"{DOMAIN}_profile_{suffix}.prof")
+    summary_path = hass.config.path(f"{DOMAIN}_profile_{suffix}.txt")
+    memory_path = hass.config.path(f"{DOMAIN}_memory_{suffix}.txt")
+    await hass.async_add_executor_job(_write_results, profiler, snapshot, profile_path, summary_path, memory_path)
+
+    return {"profile": profile_path, "summary": summary_path, "memory": memory_path}
+
+
+def _write_results(
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+    profile_path: str,
+    summary_path: str,
+    memory_path: str,
+) -> None:
+    package_dir = os.path.dirname(__file__)
+
+    profiler.create_stats()
+    pstats.Stats(profiler).dump_stats(profile_path)
+    with open(summary_path, "w") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(package_dir, PROFILE_TOP_ENTRIES)
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, os.path.join(package_dir, "*"))])
+    statistics = snapshot.statistics("lineno")
+    with open(memory_path, "w") as f:
+        f.write(f"Total: {sum(stat.size for stat in statistics) / 1024:.1f} KiB in {len(statistics)} lines\n\n")
+        for stat in statistics[:PROFILE_TOP_ENTRIES]:
+            f.write(f"{stat}\n")
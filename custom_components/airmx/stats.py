@@ -0,0 +1,104 @@
+from bisect import bisect_left
+from collections import defaultdict
+import dataclasses
+from typing import Any
+
+# upper bounds of the histogram buckets, in seconds
+HISTOGRAM_BOUNDS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Fixed bucket histogram of durations, cheap enough to be updated for every message."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float | None:
+        if not self.count:
+            return None
+
+        return self.total / self.count
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket containing the quantile."""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(HISTOGRAM_BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": {str(bound): count for bound, count in zip((*HISTOGRAM_BOUNDS, "inf"), self.buckets) if count},
+        }
+
+
+@dataclasses.dataclass
+class MQTTClientStats:
+    connects: int = 0
+    disconnects: int = 0
+    messages_received: int = 0
+    messages_published: int = 0
+    publish_latency: Histogram = dataclasses.field(default_factory=Histogram)
+
+    @property
+    def reconnects(self) -> int:
+        return max(0, self.connects - 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "disconnects": self.disconnects,
+            "messages_received": self.messages_received,
+            "messages_published": self.messages_published,
+            "publish_latency": self.publish_latency.as_dict(),
+        }
+
+
+@dataclasses.dataclass
+class AirWaterDeviceStats:
+    messages_received: defaultdict[int, int] = dataclasses.field(default_factory=lambda: defaultdict(int))
+    decode_time: Histogram = dataclasses.field(default_factory=Histogram)
+    notify_time: Histogram = dataclasses.field(default_factory=Histogram)
+
+    @property
+    def total_messages_received(self) -> int:
+        return sum(self.messages_received.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "messages_received": dict(self.messages_received),
+            "decode_time": self.decode_time.as_dict(),
+            "notify_time": self.notify_time.as_dict(),
+        }
@@ -9,8 +9,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .airwater.const import AirWaterFeature
 from .airwater.device import AirWaterDevice
-from .const import ATTR_ANION, ATTR_CHILD_LOCK, ATTR_HEATER, ATTR_PROXIMITY_SENSOR, DEVICES, DOMAIN
-from .entity import AirWaterEntity
+from .const import ATTR_ANION, ATTR_CHILD_LOCK, ATTR_HEATER, ATTR_PROXIMITY_SENSOR
+from .entity import AirWaterEntity, async_setup_device_entities
 
 
 @dataclass(frozen=True)
@@ -80,14 +80,17 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    device: AirWaterDevice = hass.data[DOMAIN][DEVICES][entry.entry_id]
+    async_setup_device_entities(hass, entry, async_add_entities, _get_entities)
+
+
+def _get_entities(device: AirWaterDevice, entry: ConfigEntry) -> list[SwitchEntity]:
     entities: list[SwitchEntity] = []
 
     for description in SWITCH_TYPES:
         if description.feature is None or bool(device.model.features & description.feature):
             entities.append(AirWaterGenericSwitch(device, entry, description))
 
-    async_add_entities(entities)
+    return entities
 
 
 class AirWaterGenericSwitch(AirWaterEntity, SwitchEntity):
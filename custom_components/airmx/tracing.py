@@ -0,0 +1,142 @@
+import asyncio
+from contextlib import contextmanager, nullcontext
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+import os
+import random
+import time
+from typing import Any, ContextManager, Iterator
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_FILE = "airmx_traces.jsonl"
+TRACE_FILE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_FILE_BACKUP_COUNT = 3
+FLUSH_DELAY = 5
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    rv = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            rv.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            rv.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            rv.append({"key": key, "value": {"doubleValue": value}})
+        else:
+            rv.append({"key": key, "value": {"stringValue": str(value)}})
+
+    return rv
+
+
+class Trace:
+    """Spans of a single inbound message, exported as one OTLP/JSON line."""
+
+    __slots__ = ("trace_id", "root_span_id", "started_at", "handed_off_at", "spans")
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.root_span_id = os.urandom(8).hex()
+        self.started_at = time.time_ns()
+        self.handed_off_at = 0
+        self.spans: list[dict[str, Any]] = []
+
+    def add_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        self.spans.append(
+            {
+                "traceId": self.trace_id,
+                "spanId": os.urandom(8).hex(),
+                "parentSpanId": self.root_span_id,
+                "name": name,
+                "kind": 1,
+                "startTimeUnixNano": str(start),
+                "endTimeUnixNano": str(end),
+                "attributes": _attributes(attributes),
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+        start = time.time_ns()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.time_ns(), **attributes)
+
+    def as_otlp(self, **attributes: Any) -> dict[str, Any]:
+        root = {
+            "traceId": self.trace_id,
+            "spanId": self.root_span_id,
+            "name": "airmx.message",
+            "kind": 5,
+            "startTimeUnixNano": str(self.started_at),
+            "endTimeUnixNano": str(time.time_ns()),
+            "attributes": _attributes(attributes),
+        }
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _attributes({"service.name": "airmx"})},
+                    "scopeSpans": [{"scope": {"name": __package__}, "spans": [root, *self.spans]}],
+                }
+            ]
+        }
+
+
+def trace_span(trace: Trace | None, name: str, **attributes: Any) -> ContextManager[None]:
+    if trace is None:
+        return _NULL_SPAN
+
+    return trace.span(name, **attributes)
+
+
+class Tracer:
+    """Collect sampled message traces and append them to a rotating file in the OTLP JSON Lines format."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._path = hass.config.path(TRACE_FILE)
+        self._handler: RotatingFileHandler | None = None
+        self._pending: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @staticmethod
+    def sample(rate: float) -> Trace | None:
+        """Start a trace for the given fraction of calls. Safe to call from any thread."""
+        if rate and random.random() < rate:
+            return Trace()
+
+        return None
+
+    @callback
+    def async_finish(self, trace: Trace, **attributes: Any) -> None:
+        self._pending.append(json.dumps(trace.as_otlp(**attributes), separators=(",", ":")))
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(FLUSH_DELAY, self.async_flush)
+
+    @callback
+    def async_flush(self, *_: Any) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._pending:
+            lines, self._pending = self._pending, []
+            self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        if self._handler is None:
+            self._handler = RotatingFileHandler(
+                self._path, maxBytes=TRACE_FILE_MAX_BYTES, backupCount=TRACE_FILE_BACKUP_COUNT, delay=True
+            )
+
+        for line in lines:
+            self._handler.emit(logging.makeLogRecord({"msg": line}))
+
+        self._handler.flush()
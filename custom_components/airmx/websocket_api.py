@@ -0,0 +1,172 @@
+import asyncio
+from dataclasses import asdict
+import time
+from typing import Any, Callable
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+import voluptuous as vol
+
+from .airwater.device import AirWaterDevice
+from .const import (
+    DEFAULT_HISTORY_DURATION,
+    DEFAULT_HISTORY_POINTS,
+    DEVICES,
+    DOMAIN,
+    SIGNAL_DEVICE_ADDED,
+    SIGNAL_DEVICE_REMOVED,
+)
+from .history import HISTORY_SPAN
+
+DEFAULT_TELEMETRY_INTERVAL = 1.0
+
+
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_telemetry)
+    websocket_api.async_register_command(hass, ws_history)
+
+
+class TelemetrySubscription:
+    """Forward status changes to a websocket client.
+
+    Changes that arrive while the client is throttled are merged, so intermediate frames are dropped
+    and only the latest value of each field is sent.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        min_interval: float,
+    ):
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._min_interval = min_interval
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._last_sent = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_send_snapshot(self, device: AirWaterDevice) -> None:
+        self._send(device.id, asdict(device.status))
+
+    @callback
+    def async_handle_changes(self, device_id: int, changes: dict[str, Any]) -> None:
+        self._pending.setdefault(device_id, {}).update(changes)
+        if self._flush_handle is not None:
+            return
+
+        delay = self._last_sent + self._min_interval - time.monotonic()
+        if delay > 0:
+            self._flush_handle = self._hass.loop.call_later(delay, self._async_flush)
+        else:
+            self._async_flush()
+
+    @callback
+    def async_cancel(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        self._last_sent = time.monotonic()
+
+        pending, self._pending = self._pending, {}
+        for device_id, changes in pending.items():
+            self._send(device_id, changes)
+
+    def _send(self, device_id: int, changes: dict[str, Any]) -> None:
+        self._connection.send_message(
+            websocket_api.event_message(self._msg_id, {"device_id": device_id, "changes": changes})
+        )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "airmx/subscribe_telemetry",
+        vol.Optional("device_ids"): [vol.Coerce(int)],
+        vol.Optional("min_interval", default=DEFAULT_TELEMETRY_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+    }
+)
+@callback
+def ws_subscribe_telemetry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream decoded status changes of the devices without writing them to the state machine.
+
+    Devices set up after the subscription, including hub devices, are streamed as soon as they are added.
+    """
+    subscription = TelemetrySubscription(hass, connection, msg["id"], msg["min_interval"])
+    device_unsubs: dict[int, Callable[[], None]] = {}
+
+    @callback
+    def async_add_device(device: AirWaterDevice) -> None:
+        if "device_ids" in msg and device.id not in msg["device_ids"]:
+            return
+
+        if unsub := device_unsubs.pop(device.id, None):
+            unsub()
+
+        device_unsubs[device.id] = device.async_add_status_listener(subscription.async_handle_changes)
+        subscription.async_send_snapshot(device)
+
+    @callback
+    def async_remove_device(device: AirWaterDevice) -> None:
+        if unsub := device_unsubs.pop(device.id, None):
+            unsub()
+
+    unsubs: list[Callable[[], None]] = [
+        subscription.async_cancel,
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_ADDED, async_add_device),
+        async_dispatcher_connect(hass, SIGNAL_DEVICE_REMOVED, async_remove_device),
+    ]
+
+    @callback
+    def async_unsubscribe() -> None:
+        for unsub in [*unsubs, *device_unsubs.values()]:
+            unsub()
+
+        device_unsubs.clear()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+
+    for device in list(hass.data[DOMAIN][DEVICES].values()):
+        async_add_device(device)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "airmx/history",
+        vol.Required("device_id"): vol.Coerce(int),
+        vol.Optional("duration", default=DEFAULT_HISTORY_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=HISTORY_SPAN)
+        ),
+        vol.Optional("points", default=DEFAULT_HISTORY_POINTS): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return recent status samples of a device averaged over equal windows."""
+    for device in hass.data[DOMAIN][DEVICES].values():
+        if device.id == msg["device_id"]:
+            now = time.time()
+            connection.send_result(
+                msg["id"], {"samples": device.history.query(now - msg["duration"], now, msg["points"])}
+            )
+            return
+
+    connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"Device {msg['device_id']} not found")
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""Benchmark the inbound report path.
+
+Every run starts a bare Home Assistant core in a temporary configuration directory, sets up the requested
+number of config entries and feeds STATUS_INFO/SET_INFO payloads through AirWaterDevice._async_handle_mqtt_message,
+so decoding, listener notification and entity state writes of all platforms are measured together.
+The MQTT client never touches the network and the load governor is held at the normal level.
+
+Memory per device is the growth of traced allocations during entry setup divided by the fleet size; it includes
+one-time imports of the platforms, so only compare results of the same fleet size.
+
+Payloads are synthetic unless a JSON Lines file with state reports (one per line) or a recording made with
+scripts/mqtt_replay.py is given.
+
+No baseline results are kept in the repository, they depend on the machine. To judge a change, save a run of
+the commit before it with --save and pass that file as --baseline to a run of the change on the same machine.
+
+Usage: python scripts/benchmark.py [--devices 1 50 500] [--messages 20] [--payloads FILE]
+                                   [--save FILE] [--baseline FILE]
+"""
+import argparse
+import asyncio
+from contextlib import ExitStack
+import gc
+import gzip
+import json
+import logging
+from pathlib import Path
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant import bootstrap, config_entries, loader  # noqa: E402
+from homeassistant.const import CONF_ID, CONF_MODEL  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+import paho.mqtt.client as mqtt  # noqa: E402
+
+from custom_components.airmx.airwater.const import AirWaterCommand, AirWaterModel  # noqa: E402
+from custom_components.airmx.airwater.device import AirWaterDevice  # noqa: E402
+from custom_components.airmx.const import CONF_MQTT_HOST, CONF_MQTT_PORT, CONF_SIGN_KEY, DEVICES, DOMAIN  # noqa: E402
+from custom_components.airmx.governor import LoadGovernor  # noqa: E402
+from custom_components.airmx.mqtt.client import MQTTClient  # noqa: E402
+
+REPORT_TOPIC = "airwater/01/0/1/1/"
+METRICS = {
+    "messages_per_second": ("msg/s", True),
+    "p50_ms": ("p50 ms", False),
+    "p99_ms": ("p99 ms", False),
+    "writes_per_message": ("writes/msg", False),
+    "memory_per_device_kib": ("KiB/device", False),
+}
+
+
+def synthetic_payloads(device_id: int, rng: random.Random) -> Iterator[dict[str, Any]]:
+    """Yield status reports with drifting sensor values and an occasional settings report."""
+    humidity, temperature, water = 45.0, 22.0, 100
+    while True:
+        humidity = min(max(humidity + rng.uniform(-0.5, 0.5), 20), 80)
+        temperature = min(max(temperature + rng.uniform(-0.1, 0.1), 15), 30)
+        water = max(water - rng.choice((0, 0, 1)), 0)
+        yield {
+            "cmdId": AirWaterCommand.STATUS_INFO,
+            "data": {
+                "power": 1,
+                "mode": 1,
+                "cadr": 40,
+                "lock": 0,
+                "uv": 1,
+                "anion": 1,
+                "hThreshold": 50,
+                "water": water,
+                "h0": int(humidity * 100),
+                "t0": int(temperature * 100),
+                "gooseOnline": 1,
+                "bleSignal": rng.randint(-80, -60),
+                "h": int(humidity * 100) + 150,
+                "t": int(temperature * 100) - 50,
+                "isNeedClean": 0,
+                "powerHeatStatus": 1,
+                "WUD": rng.randint(0, 3),
+                "version": "1.2.3",
+                "electrolysis": 0,
+                "wetFilm": 0,
+            },
+            "deviceId": device_id,
+            "time": int(time.time()),
+        }
+        if rng.random() < 0.1:
+            yield {
+                "cmdId": AirWaterCommand.SET_INFO,
+                "data": {
+                    "hThreshold": 50,
+                    "powerHeat": 1,
+                    "pirLock": 1,
+                    "autoShakeEnable": 1,
+                    "cleanNotify": 1,
+                    "electrolysis": 0,
+                    "electrolysisLevel": 0,
+                },
+                "deviceId": device_id,
+                "time": int(time.time()),
+            }
+
+
+def load_payloads(path: Path) -> list[dict[str, Any]]:
+    payloads = []
+    with (gzip.open if path.suffix == ".gz" else open)(path, "rt") as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            value = json.loads(line)
+            if isinstance(value, list):  # [offset, topic, payload] line of a recording
+                if not value[1].startswith(REPORT_TOPIC):
+                    continue
+                try:
+                    value = json.loads(value[2])
+                except ValueError:
+                    continue
+
+            if "cmdId" in value:
+                payloads.append(value)
+
+    return payloads
+
+
+def recorded_payloads(payloads: list[dict[str, Any]], offset: int) -> Iterator[dict[str, Any]]:
+    while True:
+        for index in range(len(payloads)):
+            yield payloads[(index + offset) % len(payloads)]
+
+
+def make_message(device_id: int, payload: dict[str, Any]) -> mqtt.MQTTMessage:
+    message = mqtt.MQTTMessage(topic=f"{REPORT_TOPIC}{device_id}".encode())
+    message.payload = json.dumps(payload).encode()
+    return message
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    custom_components = Path(config_dir) / "custom_components"
+    custom_components.mkdir()
+    (custom_components / DOMAIN).symlink_to(ROOT / "custom_components" / DOMAIN)
+
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    hass.config.components.add("bluetooth_adapters")  # not needed for MQTT devices
+    await hass.async_start()
+    return hass
+
+
+def patch_integration() -> ExitStack:
+    """Patch out MQTT I/O and hold the load governor at the normal level."""
+
+    async def async_noop(*_: Any, **__: Any) -> None:
+        return None
+
+    stack = ExitStack()
+    stack.enter_context(patch.object(MQTTClient, "async_connect", async_noop))
+    stack.enter_context(patch.object(MQTTClient, "async_disconnect", async_noop))
+    stack.enter_context(patch.object(MQTTClient, "async_publish", async_noop))
+    stack.enter_context(patch.object(MQTTClient, "connected", True))
+    stack.enter_context(patch.object(LoadGovernor, "async_start", lambda _: None))
+    return stack
+
+
+async def async_setup_devices(hass: HomeAssistant, device_ids: Iterable[int]) -> list[AirWaterDevice]:
+    for device_id in device_ids:
+        entry = config_entries.ConfigEntry(
+            data={
+                CONF_ID: device_id,
+                CONF_MODEL: AirWaterModel.A3S,
+                CONF_MQTT_HOST: "127.0.0.1",
+                CONF_MQTT_PORT: 1883,
+                CONF_SIGN_KEY: "benchmark",
+            },
+            discovery_keys=MappingProxyType({}),
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source=config_entries.SOURCE_USER,
+            title=f"AirWater {device_id}",
+            unique_id=str(device_id),
+            version=1,
+        )
+        await hass.config_entries.async_add(entry)
+
+    await hass.async_block_till_done()
+    return list(hass.data[DOMAIN][DEVICES].values())
+
+
+async def async_run(count: int, messages: int, recorded: list[dict[str, Any]] | None, seed: int) -> dict[str, float]:
+    rng = random.Random(seed)
+    writes = 0
+    write_ha_state = Entity.async_write_ha_state
+
+    def counting_write_ha_state(self: Entity) -> None:
+        nonlocal writes
+        writes += 1
+        write_ha_state(self)
+
+    with (
+        tempfile.TemporaryDirectory() as config_dir,
+        patch_integration(),
+        patch.object(Entity, "async_write_ha_state", counting_write_ha_state),
+    ):
+        hass = await async_start_hass(config_dir)
+
+        gc.collect()
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        devices = await async_setup_devices(hass, range(1, count + 1))
+        gc.collect()
+        memory_per_device = (tracemalloc.get_traced_memory()[0] - memory_before) / count
+        tracemalloc.stop()
+
+        sources = [
+            recorded_payloads(recorded, rng.randrange(len(recorded))) if recorded else synthetic_payloads(d.id, rng)
+            for d in devices
+        ]
+        queue = [make_message(d.id, next(s)) for _ in range(messages) for d, s in zip(devices, sources)]
+
+        writes = 0
+        latencies = []
+        started_at = time.perf_counter()
+        for device, message in zip(devices * messages, queue):
+            message_started_at = time.perf_counter()
+            await device._async_handle_mqtt_message(message)
+            latencies.append(time.perf_counter() - message_started_at)
+
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started_at
+        await hass.async_stop(force=True)
+
+    latencies.sort()
+    return {
+        "messages_per_second": len(queue) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "writes_per_message": writes / len(queue),
+        "memory_per_device_kib": memory_per_device / 1024,
+    }
+
+
+def format_delta(value: float, baseline: float | None, higher_is_better: bool) -> str:
+    if not baseline:
+        return ""
+
+    change = (value - baseline) / baseline * 100
+    better = change > 0 if higher_is_better else change < 0
+    return f" ({change:+.1f}%{'' if abs(change) < 5 else ' better' if better else ' worse'})"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 50, 500], help="fleet sizes to run")
+    parser.add_argument("--messages", type=int, default=20, help="messages per device")
+    parser.add_argument("--payloads", type=Path, help="JSON Lines file with state reports or an MQTT recording")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="write the results to a JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare with results saved earlier")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    recorded = load_payloads(args.payloads) if args.payloads else None
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    results = {}
+    for count in args.devices:
+        result = results[str(count)] = asyncio.run(async_run(count, args.messages, recorded, args.seed))
+        print(f"{count} device(s):")
+        for key, (label, higher_is_better) in METRICS.items():
+            delta = format_delta(result[key], baseline.get(str(count), {}).get(key), higher_is_better)
+            print(f"  {label:12} {result[key]:10.3f}{delta}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Check the import cost of the integration modules.
+
+Each module is imported in a fresh interpreter after the Home Assistant modules that are always loaded
+before it, so only the cost added by the integration is measured. The times are reported, wall-clock time
+varies too much between machines to fail on by default. Fails when a module pulls in a module that should
+only be loaded on demand (the same check runs in tests/test_import_time.py) or exceeds --budget-ms if given.
+
+Usage: python scripts/import_time.py [--budget-ms 250]
+"""
+import argparse
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.airmx"
+PRELOADED = ["homeassistant.core", "homeassistant.config_entries", "homeassistant.helpers.entity_platform"]
+MODULES = {
+    PACKAGE: [],
+    f"{PACKAGE}.config_flow": ["homeassistant.data_entry_flow", "homeassistant.helpers.selector"],
+    f"{PACKAGE}.diagnostics": ["homeassistant.components.diagnostics"],
+    f"{PACKAGE}.binary_sensor": ["homeassistant.components.binary_sensor"],
+    f"{PACKAGE}.humidifier": ["homeassistant.components.humidifier"],
+    f"{PACKAGE}.number": ["homeassistant.components.number"],
+    f"{PACKAGE}.select": ["homeassistant.components.select"],
+    f"{PACKAGE}.sensor": ["homeassistant.components.sensor"],
+    f"{PACKAGE}.switch": ["homeassistant.components.switch"],
+}
+DEFERRED = ["bleak", "numpy", "paho", "homeassistant.components.bluetooth"]
+
+MEASURE = """
+import importlib, json, sys, time
+for name in {preload!r}:
+    importlib.import_module(name)
+loaded = set(sys.modules)
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+deferred = sorted(name for name in set(sys.modules) - loaded if name.split(".")[0] in {deferred!r} or name in {deferred!r})
+print(json.dumps({{"elapsed": elapsed, "deferred": deferred}}))
+"""
+
+
+def measure(module: str, preload: list[str], repeat: int) -> tuple[float, list[str]]:
+    results = []
+    for _ in range(repeat):
+        code = MEASURE.format(preload=PRELOADED + preload, module=module, deferred=DEFERRED)
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+        results.append(json.loads(output.stdout))
+
+    return min(r["elapsed"] for r in results), results[0]["deferred"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, help="maximum import time per module, not checked by default")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module, the fastest one is used")
+    args = parser.parse_args()
+
+    failed = False
+    for module, preload in MODULES.items():
+        elapsed, deferred = measure(module, preload, args.repeat)
+        elapsed_ms = elapsed * 1000
+        status = "ok"
+        if args.budget_ms is not None and elapsed_ms > args.budget_ms:
+            status = "over budget"
+        if deferred:
+            status = f"imports {', '.join(deferred)}"
+
+        failed |= status != "ok"
+        print(f"{module:40} {elapsed_ms:8.1f} ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Record AirWater MQTT traffic and replay it.
+
+A recording is a JSON Lines file (gzip compressed when the name ends with .gz). The first line is a header,
+every other line is [offset in seconds, topic, payload]. Payloads are stored as text, undecodable bytes
+are kept with the surrogateescape error handler so malformed reports are replayed byte for byte.
+
+  record     subscribe to airwater/# on a broker and append the traffic to a file until interrupted
+  replay     publish the device reports of a recording to a broker
+  integrate  set up a bare Home Assistant with an entry per recorded device and deliver the reports through
+             MQTTClient from a separate thread, the way paho does, then print the integration counters
+
+Replay speed is a multiplier of the recorded pace, 0 replays as fast as possible.
+
+The integrate mode sets up Home Assistant with the harness of scripts/benchmark.py, its counters are only
+comparable with runs of the same recording on the same machine.
+
+Usage: python scripts/mqtt_replay.py record FILE [--host 127.0.0.1] [--port 1883]
+       python scripts/mqtt_replay.py replay FILE [--speed 1] [--host 127.0.0.1] [--port 1883]
+       python scripts/mqtt_replay.py integrate FILE [--speed 1]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import IO, Iterator
+
+import paho.mqtt.client as mqtt
+
+_LOGGER = logging.getLogger("mqtt_replay")
+
+RECORDING_FORMAT = "airmx-mqtt"
+RECORDING_VERSION = 1
+REPORT_TOPIC = "airwater/01/0/1/1/"
+
+Record = tuple[float, str, bytes]
+
+
+def open_recording(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, f"{mode}t", encoding="utf-8", errors="surrogateescape")
+
+    return open(path, mode, encoding="utf-8", errors="surrogateescape")
+
+
+def read_recording(path: Path) -> Iterator[Record]:
+    with open_recording(path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != RECORDING_FORMAT or header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a recording of version {RECORDING_VERSION}")
+
+        for line in f:
+            offset, topic, payload = json.loads(line)
+            yield offset, topic, payload.encode("utf-8", "surrogateescape")
+
+
+def paced(records: Iterator[Record], speed: float) -> Iterator[Record]:
+    """Yield the records no earlier than their offset divided by speed."""
+    started_at = time.monotonic()
+    for record in records:
+        if speed > 0 and (delay := started_at + record[0] / speed - time.monotonic()) > 0:
+            time.sleep(delay)
+
+        yield record
+
+
+def record(args: argparse.Namespace) -> int:
+    started_at = time.monotonic()
+    count = 0
+
+    with open_recording(args.file, "w") as f:
+        f.write(json.dumps({"format": RECORDING_FORMAT, "version": RECORDING_VERSION, "started_at": time.time()}))
+        f.write("\n")
+
+        def on_connect(client: mqtt.Client, _userdata: None, _flags: dict[str, int], rc: int) -> None:
+            _LOGGER.info("Connected to MQTT server (%d), recording to %s", rc, args.file)
+            client.subscribe("airwater/#")
+
+        def on_message(_client: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage) -> None:
+            nonlocal count
+            offset = round(time.monotonic() - started_at, 3)
+            payload = msg.payload.decode("utf-8", "surrogateescape")
+            f.write(json.dumps([offset, msg.topic, payload], separators=(",", ":")))
+            f.write("\n")
+            count += 1
+
+        client = mqtt.Client()
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.connect(args.host, args.port)
+        try:
+            client.loop_forever()
+        except KeyboardInterrupt:
+            client.disconnect()
+
+    _LOGGER.info("Recorded %d messages", count)
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    client = mqtt.Client()
+    client.connect(args.host, args.port)
+    client.loop_start()
+
+    count = 0
+    started_at = time.monotonic()
+    for _, topic, payload in paced(read_recording(args.file), args.speed):
+        if topic.startswith(REPORT_TOPIC):
+            client.publish(topic, payload).wait_for_publish()
+            count += 1
+
+    client.loop_stop()
+    client.disconnect()
+    _LOGGER.info("Published %d messages in %.1f s", count, time.monotonic() - started_at)
+    return 0
+
+
+async def async_integrate(args: argparse.Namespace) -> None:
+    # Home Assistant is only needed here, record and replay work with paho alone
+    from benchmark import async_setup_devices, async_start_hass, patch_integration
+
+    from custom_components.airmx.stats import Histogram
+
+    records = [r for r in read_recording(args.file) if r[1].startswith(REPORT_TOPIC)]
+    device_ids = sorted({int(topic.removeprefix(REPORT_TOPIC)) for _, topic, _ in records})
+
+    with tempfile.TemporaryDirectory() as config_dir, patch_integration():
+        hass = await async_start_hass(config_dir)
+        devices = {device.id: device for device in await async_setup_devices(hass, device_ids)}
+
+        def deliver() -> None:
+            for _, topic, payload in paced(iter(records), args.speed):
+                message = mqtt.MQTTMessage(topic=topic.encode())
+                message.payload = payload
+                devices[int(topic.removeprefix(REPORT_TOPIC))]._mqttc._mqtt_on_message(None, None, message)
+
+        started_at = time.perf_counter()
+        await hass.async_add_executor_job(deliver)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started_at
+
+        decode_time, notify_time = Histogram(), Histogram()
+        for device in devices.values():
+            decode_time.merge(device.stats.decode_time)
+            notify_time.merge(device.stats.notify_time)
+
+        print(f"{len(records)} messages for {len(devices)} device(s) in {elapsed:.2f} s")
+        print(f"  handled:     {sum(d.stats.total_messages_received for d in devices.values())}")
+        print(f"  decode time: {json.dumps(decode_time.as_dict())}")
+        print(f"  notify time: {json.dumps(notify_time.as_dict())}")
+
+        await hass.async_stop(force=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name in ("record", "replay", "integrate"):
+        subparser = subparsers.add_parser(name)
+        subparser.add_argument("file", type=Path)
+        if name != "integrate":
+            subparser.add_argument("--host", default="127.0.0.1")
+            subparser.add_argument("--port", type=int, default=1883)
+        if name != "record":
+            subparser.add_argument("--speed", type=float, default=1.0, help="0 for as fast as possible")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    match args.command:
+        case "record":
+            return record(args)
+        case "replay":
+            return replay(args)
+        case _:
+            logging.getLogger().setLevel(logging.ERROR)
+            asyncio.run(async_integrate(args))
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Simulate a fleet of AirWater devices on a local MQTT broker.
+
+Every virtual device listens for commands on airwater/01/1/0/1/<id> and reports on airwater/01/0/1/1/<id>,
+so the integration can be pointed at the broker and load tested without real humidifiers.
+Commands with a wrong signature are ignored, just like the real device does.
+
+After GET_STATUS a device reports STATUS_INFO every second for durationTime seconds and then every
+frequencyTime seconds until the next GET_STATUS. CONTROL is answered with STATUS_INFO and SET with SET_INFO.
+
+Faults can be injected with a probability per reply:
+  --slow-rate       delay the reply by --slow-delay seconds
+  --malformed-rate  send a truncated JSON payload
+  --silence-rate    stop replying and reporting for --silence-duration seconds
+
+Usage: python scripts/simulator.py --count 50 --model A3S --sign-key KEY [--host 127.0.0.1] [--port 1883]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any
+
+# only the protocol constants are loaded, importing the integration package would require Home Assistant
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "airmx" / "airwater"))
+
+from const import AirWaterCommand, AirWaterFeature, AirWaterMode, AirWaterModel  # noqa: E402
+import paho.mqtt.client as mqtt  # noqa: E402
+
+_LOGGER = logging.getLogger("simulator")
+
+COMMAND_TOPIC = "airwater/01/1/0/1/"
+REPORT_TOPIC = "airwater/01/0/1/1/"
+STREAM_INTERVAL = 1.0
+DEFAULT_FREQUENCY_TIME = 600
+
+
+def dump(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def sign(command: dict[str, Any], sign_key: str) -> str:
+    return hashlib.md5(f"{dump(command)[1:-1]},{sign_key}".encode()).hexdigest()
+
+
+class VirtualDevice:
+    def __init__(self, simulator: "FleetSimulator", device_id: int, model: AirWaterModel):
+        self.id = device_id
+        self.model = model
+        self._simulator = simulator
+        self._rng = random.Random(device_id)
+        self._wakeup = asyncio.Event()
+        self._stream_until = 0.0
+        self._frequency_time = DEFAULT_FREQUENCY_TIME
+        self._silent_until = 0.0
+
+        self.status: dict[str, Any] = {
+            "power": 1,
+            "mode": AirWaterMode.AUTO,
+            "cadr": 3 if model.features & AirWaterFeature.FAN_SPEED_STEPS else 40,
+            "lock": 0,
+            "uv": 1,
+            "anion": int(bool(model.features & AirWaterFeature.ANION)),
+            "water": 100,
+            "h0": 4000 + self._rng.randint(0, 1000),
+            "t0": 2200 + self._rng.randint(0, 300),
+            "gooseOnline": 0,
+            "bleSignal": -100,
+            "isNeedClean": 0,
+            "powerHeatStatus": 0,
+            "WUD": 0,
+            "version": "simulator",
+            "electrolysis": 0,
+            "wetFilm": 0,
+        }
+        self.settings: dict[str, Any] = {
+            "hThreshold": 50,
+            "powerHeat": int(bool(model.features & AirWaterFeature.HEATER)),
+            "pirLock": 1,
+            "autoShakeEnable": 1,
+            "cleanNotify": 1,
+            "electrolysis": 0,
+            "electrolysisLevel": 0,
+        }
+
+    @property
+    def silent(self) -> bool:
+        return time.monotonic() < self._silent_until
+
+    async def async_run(self) -> None:
+        while True:
+            now = time.monotonic()
+            interval = STREAM_INTERVAL if now < self._stream_until else self._frequency_time
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+                self._wakeup.clear()
+            except asyncio.TimeoutError:
+                self._drift()
+                await self.async_reply(AirWaterCommand.STATUS_INFO)
+
+    async def async_handle_command(self, command: dict[str, Any]) -> None:
+        data = command.get("data", {})
+        match command.get("cmdId"):
+            case AirWaterCommand.GET_STATUS:
+                self._stream_until = time.monotonic() + int(data.get("durationTime", 0))
+                self._frequency_time = int(data.get("frequencyTime", DEFAULT_FREQUENCY_TIME))
+                self._wakeup.set()
+                await self.async_reply(AirWaterCommand.STATUS_INFO)
+            case AirWaterCommand.CONTROL:
+                self.status.update({k: int(v) for k, v in data.items() if k in self.status})
+                await self.async_reply(AirWaterCommand.STATUS_INFO)
+            case AirWaterCommand.SET:
+                self.settings.update({k: int(v) for k, v in data.items() if k in self.settings})
+                await self.async_reply(AirWaterCommand.SET_INFO)
+            case cmd_id:
+                _LOGGER.warning("Device %d received unsupported command %s", self.id, cmd_id)
+
+    async def async_reply(self, command: AirWaterCommand) -> None:
+        options = self._simulator.options
+        if self.silent:
+            return
+
+        if self._rng.random() < options.silence_rate:
+            _LOGGER.info("Device %d goes silent for %d s", self.id, options.silence_duration)
+            self._silent_until = time.monotonic() + options.silence_duration
+            return
+
+        if self._rng.random() < options.slow_rate:
+            await asyncio.sleep(options.slow_delay)
+
+        if command == AirWaterCommand.STATUS_INFO:
+            data = {**self.status, "hThreshold": self.settings["hThreshold"]}
+            if self.model.features & AirWaterFeature.HEATER:
+                data["powerHeatStatus"] = self.settings["powerHeat"] & self.status["power"]
+        else:
+            data = dict(self.settings)
+
+        report: dict[str, Any] = {"cmdId": int(command), "time": int(time.time()), "data": data}
+        report["sig"] = sign(report, options.sign_key)
+        payload = dump(report)
+        if self._rng.random() < options.malformed_rate:
+            payload = payload[: self._rng.randint(1, len(payload) - 1)]
+
+        self._simulator.publish(f"{REPORT_TOPIC}{self.id}", payload)
+
+    def _drift(self) -> None:
+        if self.status["power"]:
+            direction = 1 if self.status["h0"] < self.settings["hThreshold"] * 100 else -1
+            self.status["h0"] += direction * self._rng.randint(0, 20)
+            self.status["water"] = max(0, self.status["water"] - self._rng.choice((0, 0, 0, 1)))
+        else:
+            self.status["h0"] -= self._rng.randint(0, 5)
+
+        self.status["t0"] += self._rng.randint(-5, 5)
+
+
+class FleetSimulator:
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.loop = asyncio.get_running_loop()
+        self.devices = {
+            device_id: VirtualDevice(self, device_id, AirWaterModel[options.model])
+            for device_id in range(options.first_id, options.first_id + options.count)
+        }
+        self.commands_received = 0
+        self.reports_sent = 0
+
+        self._client = mqtt.Client()
+        self._client.on_connect = self._mqtt_on_connect
+        self._client.on_message = self._mqtt_on_message
+
+    async def async_run(self) -> None:
+        self._client.connect(self.options.host, self.options.port)
+        self._client.loop_start()
+        _LOGGER.info("Simulating %d %s device(s)", len(self.devices), self.options.model)
+
+        tasks = [asyncio.create_task(device.async_run()) for device in self.devices.values()]
+        try:
+            while True:
+                await asyncio.sleep(10)
+                _LOGGER.info("Commands received: %d, reports sent: %d", self.commands_received, self.reports_sent)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._client.loop_stop()
+            self._client.disconnect()
+
+    def publish(self, topic: str, payload: str) -> None:
+        self.reports_sent += 1
+        self._client.publish(topic, payload)
+
+    def _mqtt_on_connect(self, client: mqtt.Client, _userdata: None, _flags: dict[str, int], rc: int) -> None:
+        _LOGGER.info("Connected to MQTT server (%d)", rc)
+        client.subscribe(f"{COMMAND_TOPIC}+")
+
+    def _mqtt_on_message(self, _client: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage) -> None:
+        self.loop.call_soon_threadsafe(self._handle_message, msg.topic, msg.payload)
+
+    def _handle_message(self, topic: str, payload: bytes) -> None:
+        try:
+            device = self.devices[int(topic.removeprefix(COMMAND_TOPIC))]
+        except (KeyError, ValueError):
+            return
+
+        self.commands_received += 1
+        try:
+            command = json.loads(payload)
+            signature = command.pop("sig")
+        except (ValueError, KeyError):
+            _LOGGER.warning("Device %d received a malformed command: %r", device.id, payload)
+            return
+
+        if signature != sign(command, self.options.sign_key):
+            _LOGGER.warning("Device %d received a command with invalid signature", device.id)
+            return
+
+        if not device.silent:
+            self.loop.create_task(device.async_handle_command(command))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--count", type=int, default=1, help="number of devices")
+    parser.add_argument("--first-id", type=int, default=1, help="id of the first device")
+    parser.add_argument("--model", choices=[model.name for model in AirWaterModel], default=AirWaterModel.A3S.name)
+    parser.add_argument("--sign-key", required=True, help="sign key shared by all simulated devices")
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-delay", type=float, default=5.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--silence-rate", type=float, default=0.0)
+    parser.add_argument("--silence-duration", type=float, default=60.0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if options.verbose else logging.INFO, format="%(asctime)s %(message)s")
+
+    async def async_main() -> None:
+        await FleetSimulator(options).async_run()
+
+    try:
+        asyncio.run(async_main())
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
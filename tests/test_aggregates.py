@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from custom_components.airmx.aggregates import FLEET_GROUP, REFILL_WATER_LEVEL, Aggregate, Contribution, FleetAggregator
+from custom_components.airmx.airwater.device import AirWaterDeviceStatus
+
+
+def _device(status: AirWaterDeviceStatus) -> MagicMock:
+    return MagicMock(status=status)
+
+
+def test_contribution_from_status() -> None:
+    status = AirWaterDeviceStatus(
+        internal_sensor_humidity=40,
+        remote_sensor_humidity=55,
+        remote_sensor_online=True,
+        water_level=REFILL_WATER_LEVEL,
+    )
+
+    assert Contribution.from_status(_device(status)) == Contribution(humidity=55, need_refill=True)
+    assert Contribution.from_status(
+        _device(status), {"remote_sensor_online": False, "water_level": 50, "need_cleaning": True}
+    ) == Contribution(humidity=40, need_cleaning=True)
+
+
+def test_contribution_apply() -> None:
+    aggregate = Aggregate()
+
+    Contribution(humidity=40, need_refill=True).apply(aggregate, 1)
+    Contribution(need_cleaning=True).apply(aggregate, 1)
+    assert aggregate == Aggregate(devices=2, humidity_sum=40, humidity_count=1, need_cleaning=1, need_refill=1)
+
+    Contribution(humidity=40, need_refill=True).apply(aggregate, -1)
+    assert aggregate == Aggregate(devices=1, need_cleaning=1)
+    assert aggregate.average_humidity is None
+
+
+def test_incremental_update() -> None:
+    aggregator = FleetAggregator(MagicMock(), group_by_area=False)
+    listener = MagicMock()
+    aggregator.async_add_listener(FLEET_GROUP, listener)
+
+    aggregator._set_contribution(1, None, Contribution(humidity=40))
+    aggregator._set_contribution(2, None, Contribution(humidity=60))
+    assert aggregator.groups[FLEET_GROUP].devices == 2
+    assert aggregator.groups[FLEET_GROUP].average_humidity == 50
+    assert listener.call_count == 2
+
+    aggregator._set_contribution(1, None, Contribution(humidity=40))
+    assert listener.call_count == 2
+
+    aggregator._set_contribution(1, None, Contribution(humidity=50))
+    assert aggregator.groups[FLEET_GROUP].average_humidity == 55
+
+    aggregator._set_contribution(2, None, None)
+    assert aggregator.groups[FLEET_GROUP] == Aggregate(devices=1, humidity_sum=50, humidity_count=1)
+    assert listener.call_count == 4
+
+
+def test_area_groups() -> None:
+    aggregator = FleetAggregator(MagicMock(), group_by_area=True)
+    group_listener = MagicMock()
+    aggregator.async_add_group_listener(group_listener)
+
+    aggregator._set_contribution(1, "kitchen", Contribution(humidity=40))
+    aggregator._set_contribution(2, "kitchen", Contribution(humidity=50))
+    group_listener.assert_called_once_with("kitchen")
+    assert aggregator.groups["kitchen"].average_humidity == 45
+
+    aggregator._set_contribution(2, "bedroom", Contribution(humidity=50))
+    assert aggregator.groups["kitchen"].devices == 1
+    assert aggregator.groups["bedroom"].devices == 1
+    assert aggregator.groups[FLEET_GROUP].devices == 2
+    assert aggregator.groups[FLEET_GROUP].average_humidity == 45
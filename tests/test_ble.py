@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import Any, Callable
+from unittest.mock import MagicMock
+
+from bleak import BleakError
+import pytest
+
+from custom_components.airmx.airwater import ble
+from custom_components.airmx.airwater.ble import (
+    BIND_AP_ATTEMPTS,
+    BIND_AP_DONE,
+    COMMAND_UUID,
+    AirWaterBindAPError,
+    AirWaterBindAPTimeout,
+    AirWaterBLEConnector,
+    BindAPRequest,
+    build_bind_ap_ack_packet,
+    build_bind_ap_packets,
+)
+
+
+class FakeBleakClient:
+    """Client that confirms the binding after the last frame of the request is written."""
+
+    def __init__(self, properties: list[str], confirm: bool = True, connect_errors: list[Exception] | None = None):
+        self.confirm = confirm
+        self.connect_errors = connect_errors or []
+        self.connects = 0
+        self.writes: list[tuple[bytes, bool]] = []
+        self.services = MagicMock()
+        self.services.get_characteristic.return_value = MagicMock(properties=properties)
+        self._handler: Callable[[Any, bytearray], None] | None = None
+
+    def __call__(self, _: Any) -> "FakeBleakClient":
+        return self
+
+    async def __aenter__(self) -> "FakeBleakClient":
+        self.connects += 1
+        if self.connect_errors:
+            raise self.connect_errors.pop(0)
+
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        return None
+
+    async def start_notify(self, _: str, handler: Callable[[Any, bytearray], None]) -> None:
+        self._handler = handler
+
+    async def stop_notify(self, _: str) -> None:
+        self._handler = None
+
+    async def write_gatt_char(self, uuid: str, data: bytes, response: bool = False) -> None:
+        assert uuid == COMMAND_UUID
+        self.writes.append((bytes(data), response))
+
+        is_last_frame = data[2:4] == b"\x00\x15" and data[0] == (data[1] & 0x0F) - 1
+        if self.confirm and is_last_frame and self._handler:
+            asyncio.get_running_loop().call_soon(self._handler, None, bytearray(BIND_AP_DONE))
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ble, "BIND_AP_RETRY_DELAY", 0)
+
+
+def test_bind_ap_request() -> None:
+    assert BindAPRequest("wifi", "secret").as_bytes == b"\x04wifi\x06secret"
+
+
+@pytest.mark.parametrize(
+    ("size", "headers"),
+    [
+        (1, ["0011"]),
+        (16, ["0011"]),
+        (17, ["0012", "0122"]),
+        (40, ["0013", "0123", "0233"]),
+    ],
+)
+def test_build_bind_ap_packets(size: int, headers: list[str]) -> None:
+    request = bytes(range(size))
+    packets = build_bind_ap_packets(request)
+
+    assert [packet[:2].hex() for packet in packets] == headers
+    assert all(packet[2:4] == b"\x00\x15" for packet in packets)
+    assert all(len(packet) <= 4 + ble.PACKET_SIZE for packet in packets)
+    assert b"".join(packet[4:] for packet in packets) == request
+
+
+def test_build_bind_ap_ack_packet() -> None:
+    assert build_bind_ap_ack_packet(3) == bytes.fromhex("03110016")
+
+
+def test_bind_ap(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeBleakClient(["write", "write-without-response", "notify"])
+    monkeypatch.setattr(ble, "BleakClient", client)
+    packets = build_bind_ap_packets(BindAPRequest("wifi-network-name", "a-long-wifi-password").as_bytes)
+
+    started_at = time.perf_counter()
+    asyncio.run(AirWaterBLEConnector().bind_ap(MagicMock(), "wifi-network-name", "a-long-wifi-password"))
+    elapsed = time.perf_counter() - started_at
+
+    assert client.connects == 1
+    assert client.writes == [
+        *((packet, index == len(packets) - 1) for index, packet in enumerate(packets)),
+        (build_bind_ap_ack_packet(len(packets)), True),
+    ]
+    assert elapsed < 0.2, f"binding took {elapsed:.3f} s"
+
+
+def test_bind_ap_write_with_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeBleakClient(["write", "notify"])
+    monkeypatch.setattr(ble, "BleakClient", client)
+
+    asyncio.run(AirWaterBLEConnector().bind_ap(MagicMock(), "wifi-network-name", "a-long-wifi-password"))
+
+    assert all(response for _, response in client.writes)
+
+
+def test_bind_ap_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeBleakClient(["write", "write-without-response", "notify"], connect_errors=[BleakError("busy")])
+    monkeypatch.setattr(ble, "BleakClient", client)
+
+    asyncio.run(AirWaterBLEConnector().bind_ap(MagicMock(), "wifi", "secret"))
+
+    assert client.connects == 2
+    assert client.writes[-1] == (build_bind_ap_ack_packet(1), True)
+
+
+def test_bind_ap_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeBleakClient(["write", "notify"], connect_errors=[BleakError("busy")] * BIND_AP_ATTEMPTS)
+    monkeypatch.setattr(ble, "BleakClient", client)
+
+    with pytest.raises(AirWaterBindAPError):
+        asyncio.run(AirWaterBLEConnector().bind_ap(MagicMock(), "wifi", "secret"))
+
+    assert client.connects == BIND_AP_ATTEMPTS
+
+
+def test_bind_ap_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeBleakClient(["write", "notify"], confirm=False)
+    monkeypatch.setattr(ble, "BleakClient", client)
+    monkeypatch.setattr(ble, "BIND_AP_TIMEOUT", 0.01)
+
+    with pytest.raises(AirWaterBindAPTimeout):
+        asyncio.run(AirWaterBLEConnector().bind_ap(MagicMock(), "wifi", "secret"))
+
+    assert client.connects == BIND_AP_ATTEMPTS
+    assert not any(data == build_bind_ap_ack_packet(1) for data, _ in client.writes)
@@ -0,0 +1,57 @@
+import pytest
+
+from custom_components.airmx.airwater.controller import (
+    HYSTERESIS,
+    MAX_PI_STEP,
+    PI_KI,
+    AirWaterControllerType,
+    AirWaterHumidityController,
+)
+
+
+def test_hysteresis() -> None:
+    controller = AirWaterHumidityController(AirWaterControllerType.HYSTERESIS, max_speed=4)
+
+    assert controller.update(50, 50, 0) == 0
+    assert controller.update(50 - HYSTERESIS, 50, 1) == 4
+    assert controller.update(50, 50, 2) == 4
+    assert controller.update(50 + HYSTERESIS - 1, 50, 3) == 4
+    assert controller.update(50 + HYSTERESIS, 50, 4) == 0
+    assert controller.update(50, 50, 5) == 0
+
+
+def test_pi_proportional() -> None:
+    controller = AirWaterHumidityController(AirWaterControllerType.PI, max_speed=200)
+
+    assert controller.update(45, 50, 0) == 100
+    assert controller.update(55, 50, 0) == 0
+    assert controller.integral == 0
+
+
+def test_pi_integral() -> None:
+    controller = AirWaterHumidityController(AirWaterControllerType.PI, max_speed=100)
+
+    assert controller.update(48, 50, 0) == 20
+    assert controller.update(48, 50, 60) == 22
+    assert controller.integral == pytest.approx(2)
+
+
+def test_pi_clamp() -> None:
+    controller = AirWaterHumidityController(AirWaterControllerType.PI, max_speed=100)
+
+    assert controller.update(0, 50, 0) == 100
+    assert controller.update(0, 50, MAX_PI_STEP) == 100
+    assert controller.integral == 100 / PI_KI
+
+    assert controller.update(60, 50, MAX_PI_STEP + 60) == 0
+    assert controller.integral == pytest.approx(100 / PI_KI - 10)
+
+
+def test_pi_long_gap_is_not_integrated() -> None:
+    controller = AirWaterHumidityController(AirWaterControllerType.PI, max_speed=100)
+
+    controller.update(40, 50, 0)
+    controller.update(40, 50, MAX_PI_STEP + 1)
+
+    assert controller.integral == 0
+    assert controller.updated_at == MAX_PI_STEP + 1
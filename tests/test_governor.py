@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+
+from custom_components.airmx.governor import RECOVERY_SAMPLES, GovernorLevel, LoadGovernor
+
+
+def _governor() -> tuple[LoadGovernor, MagicMock]:
+    hass = MagicMock()
+    hass.loop.time.return_value = 0.0
+    governor = LoadGovernor(hass)
+    governor.async_start()
+    return governor, hass
+
+
+def _sample(governor: LoadGovernor, hass: MagicMock, lag: float) -> None:
+    hass.loop.time.return_value = governor._expected_at + lag
+    governor._sample()
+
+
+def test_level_rises_immediately() -> None:
+    governor, hass = _governor()
+    listener = MagicMock()
+    governor.async_add_listener(listener)
+
+    _sample(governor, hass, 0.1)
+    assert governor.level == GovernorLevel.NORMAL
+
+    _sample(governor, hass, 0.1)
+    assert governor.level == GovernorLevel.ELEVATED
+    assert governor.poll_multiplier == GovernorLevel.ELEVATED.poll_multiplier
+
+    _sample(governor, hass, 2.0)
+    assert governor.level == GovernorLevel.HIGH
+    assert listener.call_count == 2
+
+
+def test_level_recovers_one_step_at_a_time() -> None:
+    governor, hass = _governor()
+    _sample(governor, hass, 1.0)
+    assert governor.level == GovernorLevel.HIGH
+
+    levels = []
+    for _ in range(3 * RECOVERY_SAMPLES):
+        _sample(governor, hass, 0)
+        levels.append(governor.level)
+
+    # the smoothed lag stays above the high threshold for the first sample, the calm ones follow it
+    assert levels[:RECOVERY_SAMPLES] == [GovernorLevel.HIGH] * RECOVERY_SAMPLES
+    assert levels[RECOVERY_SAMPLES] == GovernorLevel.ELEVATED
+    assert levels[-1] == GovernorLevel.NORMAL
+
+
+def test_lag_spike_restarts_recovery() -> None:
+    governor, hass = _governor()
+    _sample(governor, hass, 0.5)
+    assert governor.level == GovernorLevel.ELEVATED
+
+    for _ in range(RECOVERY_SAMPLES - 1):
+        _sample(governor, hass, 0)
+
+    _sample(governor, hass, 0.2)
+    assert governor.level == GovernorLevel.ELEVATED
+
+    for _ in range(RECOVERY_SAMPLES - 1):
+        _sample(governor, hass, 0)
+
+    assert governor.level == GovernorLevel.ELEVATED
+
+
+def test_stop() -> None:
+    governor, hass = _governor()
+
+    governor.async_stop()
+
+    hass.loop.call_at.return_value.cancel.assert_called_once()
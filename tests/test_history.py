@@ -0,0 +1,51 @@
+from custom_components.airmx.airwater.device import AirWaterDeviceStatus
+from custom_components.airmx.history import TelemetryHistory
+
+
+def _status(humidity: float) -> AirWaterDeviceStatus:
+    return AirWaterDeviceStatus(power=True, fan_speed=2, internal_sensor_humidity=humidity)
+
+
+def test_resolution() -> None:
+    history = TelemetryHistory(size=10, resolution=5)
+
+    history.add(_status(40), now=0)
+    history.add(_status(41), now=4.9)
+    assert len(history) == 1
+
+    history.add(_status(42), now=5)
+    assert len(history) == 2
+
+
+def test_ring_keeps_last_samples() -> None:
+    history = TelemetryHistory(size=3, resolution=1)
+    for second in range(5):
+        history.add(_status(40 + second), now=second)
+
+    times, values = history.columns()
+    assert len(history) == 3
+    assert list(times) == [2, 3, 4]
+    assert list(values["humidity"]) == [42, 43, 44]
+
+
+def test_query_averages_windows() -> None:
+    history = TelemetryHistory(size=10, resolution=1)
+    for second in range(10):
+        history.add(_status(40 + second), now=second)
+
+    samples = history.query(0, 10, 2)
+
+    assert [sample["time"] for sample in samples] == [0, 5]
+    assert [sample["humidity"] for sample in samples] == [42, 47]
+    assert all(sample["temperature"] is None for sample in samples)
+    assert all(sample["power"] == 1 for sample in samples)
+
+
+def test_query_omits_empty_windows() -> None:
+    history = TelemetryHistory(size=10, resolution=1)
+    for second in range(10):
+        history.add(_status(40 + second), now=second)
+
+    assert len(history.query(0, 20, 4)) == 2
+    assert [sample["humidity"] for sample in history.query(5, 9, 1)] == [46.5]
+    assert history.query(20, 30, 5) == []
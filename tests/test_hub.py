@@ -0,0 +1,104 @@
+import asyncio
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.const import CONF_DEVICES, CONF_ID
+
+from custom_components.airmx.airwater.const import AirWaterModel
+from custom_components.airmx.const import CONF_MQTT_HOST, CONF_MQTT_PORT, DOMAIN, TRACER
+from custom_components.airmx.discovery import AirWaterDeviceInfo, AirWaterDiscoveryResult
+from custom_components.airmx.hub import AirWaterHub
+
+
+def _hub(entries_data: list[dict[str, Any]] | None = None) -> tuple[AirWaterHub, dict[int, MagicMock]]:
+    """Hub whose devices are plain mocks, the config entries of other devices have the given data."""
+    hass = MagicMock()
+    hass.data = {DOMAIN: {TRACER: None}}
+    entry = MagicMock(entry_id="hub", data={CONF_MQTT_HOST: "localhost", CONF_MQTT_PORT: 1883, CONF_DEVICES: []})
+    hass.config_entries.async_entries.return_value = [entry, *(MagicMock(data=data) for data in entries_data or [])]
+    hub = AirWaterHub(hass, entry, MagicMock())
+    devices: dict[int, MagicMock] = {}
+
+    async def add_device(device_id: int, model: AirWaterModel, sign_key: str) -> MagicMock:
+        device = MagicMock(id=device_id, model=model, connection_params=("", 0, sign_key))
+        device.async_start = AsyncMock()
+        device.async_remove_stores = AsyncMock()
+        hub.devices[device_id] = devices[device_id] = device
+        return device
+
+    async def remove_device(device_id: int) -> MagicMock:
+        return hub.devices.pop(device_id)
+
+    setattr(hub, "_async_add_device", add_device)
+    setattr(hub, "_async_remove_device", remove_device)
+    setattr(hub, "_async_remove_registry_device", MagicMock())
+    return hub, devices
+
+
+def _result(*devices: tuple[int, AirWaterModel | None]) -> AirWaterDiscoveryResult:
+    return AirWaterDiscoveryResult(
+        wifi_devices={
+            device_id: AirWaterDeviceInfo(id=device_id, ble_mac="", sign_key=f"key{device_id}", model=model)
+            for device_id, model in devices
+        }
+    )
+
+
+def _saved_ids(hub: AirWaterHub) -> list[int]:
+    data = hub._hass.config_entries.async_update_entry.call_args.kwargs["data"]
+    return [device[CONF_ID] for device in data[CONF_DEVICES]]
+
+
+def test_add_devices() -> None:
+    hub, devices = _hub()
+
+    asyncio.run(hub._async_sync_devices(_result((1, AirWaterModel.A2), (2, AirWaterModel.A3))))
+
+    assert set(hub.devices) == {1, 2}
+    assert all(device.async_start.await_count == 1 for device in devices.values())
+    assert sorted(_saved_ids(hub)) == [1, 2]
+
+
+def test_skip_configured_and_unknown_model() -> None:
+    hub, _ = _hub([{CONF_ID: 2}])
+
+    asyncio.run(hub._async_sync_devices(_result((1, AirWaterModel.A2), (2, AirWaterModel.A3), (3, None))))
+
+    assert set(hub.devices) == {1}
+
+
+def test_known_device_keeps_model() -> None:
+    hub, _ = _hub()
+    asyncio.run(hub._async_sync_devices(_result((1, AirWaterModel.A5))))
+    hub._hass.config_entries.async_update_entry.reset_mock()
+
+    asyncio.run(hub._async_sync_devices(_result((1, None))))
+
+    assert hub.devices[1].model == AirWaterModel.A5
+    hub._hass.config_entries.async_update_entry.assert_not_called()
+
+
+def test_remove_devices() -> None:
+    hub, devices = _hub()
+    asyncio.run(hub._async_sync_devices(_result((1, AirWaterModel.A2), (2, AirWaterModel.A3))))
+    hub._hass.config_entries.async_entries.return_value.append(MagicMock(data={CONF_ID: 2}))
+
+    asyncio.run(hub._async_sync_devices(_result((2, AirWaterModel.A3))))
+
+    assert hub.devices == {}
+    assert _saved_ids(hub) == []
+    devices[1].async_remove_stores.assert_awaited_once()
+    devices[2].async_remove_stores.assert_not_awaited()  # configured by its own entry
+
+
+def test_release_device() -> None:
+    hub, devices = _hub()
+    asyncio.run(hub._async_sync_devices(_result((1, AirWaterModel.A2), (2, AirWaterModel.A3))))
+
+    asyncio.run(hub.async_release_device(1))
+    asyncio.run(hub.async_release_device(3))
+
+    assert set(hub.devices) == {2}
+    assert _saved_ids(hub) == [2]
+    cast(MagicMock, hub._async_remove_registry_device).assert_called_once_with(1)
+    devices[1].async_remove_stores.assert_not_awaited()
@@ -0,0 +1,9 @@
+from import_time import MODULES, measure
+import pytest
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_deferred_imports(module: str) -> None:
+    _, deferred = measure(module, MODULES[module], repeat=1)
+
+    assert not deferred, f"{module} imports {', '.join(deferred)} at load"
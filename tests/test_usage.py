@@ -0,0 +1,73 @@
+import math
+
+import pytest
+
+from custom_components.airmx.airwater.device import AirWaterDeviceStatus
+from custom_components.airmx.airwater.usage import CONSUMPTION_TIME_CONSTANT, MAX_REPORT_GAP, AirWaterUsage
+
+
+def _status(water_level: int | None = 50, fan_speed: int = 2, heater: bool = False) -> AirWaterDeviceStatus:
+    return AirWaterDeviceStatus(power=True, fan_speed=fan_speed, heater=heater, water_level=water_level)
+
+
+def test_runtimes() -> None:
+    usage = AirWaterUsage()
+
+    usage.update(_status(heater=True), 0)
+    usage.update(_status(fan_speed=0), 60)
+    usage.update(_status(), 90)
+
+    assert usage.heater_runtime == 60
+    assert usage.fan_runtime == 60
+
+
+def test_long_gap_is_not_accounted() -> None:
+    usage = AirWaterUsage()
+
+    usage.update(_status(water_level=50, heater=True), 0)
+    usage.update(_status(water_level=40), MAX_REPORT_GAP + 1)
+
+    assert usage.heater_runtime == 0
+    assert usage.fan_runtime == 0
+    assert usage.water_used == 0
+    assert usage.water_level == 40
+
+
+def test_water_consumption() -> None:
+    usage = AirWaterUsage()
+
+    usage.update(_status(water_level=50), 0)
+    usage.update(_status(water_level=49), 60)
+
+    assert usage.water_used == 1
+    assert usage.water_consumption == pytest.approx((1 - math.exp(-60 / CONSUMPTION_TIME_CONSTANT)) * 60)
+
+
+def test_refill_is_not_consumption() -> None:
+    usage = AirWaterUsage(water_consumption=5.0)
+
+    usage.update(_status(water_level=10), 0)
+    usage.update(_status(water_level=100), 60)
+
+    assert usage.water_used == 0
+    assert usage.water_consumption == 5.0
+
+
+def test_time_to_empty() -> None:
+    usage = AirWaterUsage(water_consumption=10.0, water_level=50)
+    assert usage.time_to_empty == 5 * 3600
+
+    usage.water_consumption = 0.0
+    assert usage.time_to_empty is None
+
+    usage = AirWaterUsage(water_consumption=10.0)
+    assert usage.time_to_empty is None
+
+
+def test_store_data() -> None:
+    usage = AirWaterUsage(water_consumption=1.5, water_used=20, heater_runtime=60, fan_runtime=120, water_level=50)
+
+    restored = AirWaterUsage.from_dict(usage.as_dict())
+
+    assert restored.as_dict() == usage.as_dict()
+    assert restored.water_level is None